@@ -40,6 +40,9 @@ def fetch_and_store_papers(topic: str, max_results: int = 20):
         
         import arxiv
         
+        # Page no larger than the fetch; Search.results() is deprecated and
+        # always pulls 100 entries on a fresh connection
+        client = arxiv.Client(page_size=min(max_results, 100), num_retries=2)
         search = arxiv.Search(
             query=topic,
             max_results=max_results,
@@ -47,7 +50,7 @@ def fetch_and_store_papers(topic: str, max_results: int = 20):
         )
         
         papers = []
-        for result in search.results():
+        for result in client.results(search):
             paper_data = {
                 'arxiv_id': result.entry_id.split('/')[-1],
                 'title': result.title,
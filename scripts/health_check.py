@@ -5,6 +5,7 @@ Returns exit code 0 if healthy, 1 if unhealthy.
 import sys
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -13,6 +14,17 @@ from src.core.config import settings
 from src.core.logging_config import app_logger
 
 
+# (connect, read) timeouts: fail fast while the API is still starting
+REQUEST_TIMEOUT = (1.0, 5.0)
+
+
+def _make_session() -> requests.Session:
+    """Session that keeps one connection alive across polling attempts."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+    return session
+
+
 def check_health(timeout: int = 30) -> bool:
     """
     Check system health.
@@ -25,11 +37,12 @@ def check_health(timeout: int = 30) -> bool:
     """
     api_url = f"http://{settings.api_host}:{settings.api_port}"
     
+    session = _make_session()
     start_time = time.time()
     
     while time.time() - start_time < timeout:
         try:
-            response = requests.get(f"{api_url}/api/v1/health/detailed", timeout=5)
+            response = session.get(f"{api_url}/api/v1/health/detailed", timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
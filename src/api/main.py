@@ -1,8 +1,9 @@
 ﻿"""
 Main FastAPI Application - PRODUCTION READY
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from src.database.connection import engine
 from src.database.models import Base
 from src.api import routes, auth_routes
@@ -25,6 +26,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (paper lists with abstracts)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -36,7 +40,9 @@ async def root():
     }
 
 @app.get("/health")
-async def health():
+async def health(response: Response):
+    # Pollers and proxies may reuse the result briefly
+    response.headers["Cache-Control"] = "max-age=5"
     return {
         "status": "healthy",
         "version": "2.0.0"
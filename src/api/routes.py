@@ -1,13 +1,16 @@
 ﻿"""
 API Routes - COMPLETE WITH ASK ENDPOINT
 """
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import select, func
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import logging
 from datetime import datetime
 import hashlib
+import json
 
 from src.database.connection import get_db
 from src.database.models import Paper, User
@@ -53,10 +56,15 @@ class SearchResponse(BaseModel):
     source: str
     cached: bool = False
 
+# SSE responses are sent uncompressed: GZipMiddleware would otherwise hold
+# each frame in its compressor buffer, and it passes through any response
+# that already declares a Content-Encoding.
+SSE_HEADERS = {"Cache-Control": "no-cache", "Content-Encoding": "identity"}
 
 
 @router.get("/health")
-async def health():
+async def health(response: Response):
+    response.headers["Cache-Control"] = "max-age=5"
     redis_status = "connected" if cache.client else "disconnected"
     return {
         "status": "healthy",
@@ -65,6 +73,126 @@ async def health():
         "airflow": "enabled"
     }
 
+def _iter_search(
+    request: SearchRequest,
+    req: Request,
+    db: Session,
+    current_user: Optional[User]
+) -> Iterator[dict]:
+    """
+    Yield search results as they become available.
+    
+    When the database has some matches but fewer than requested, they are
+    yielded first as a partial result (marked `partial`) while arXiv is
+    queried. The last item is always the complete result; if arXiv finds
+    nothing, that is the database matches.
+    """
+    logger.info(f"🔍 Search by {current_user.username if current_user else 'guest'}: '{request.query}'")
+    
+    cache_key_hash = hashlib.md5(f"search:{request.query}:{request.limit}".encode()).hexdigest()
+    
+    cached_result = cache.get(cache_key_hash)
+    if cached_result:
+        log_search(db, request.query, cached_result['total'], request.search_type, current_user, req)
+        yield {**cached_result, "cached": True}
+        return
+    
+    query_lower = request.query.lower()
+    db_papers = db.query(Paper).filter(
+        (Paper.title.ilike(f"%{query_lower}%")) |
+        (Paper.abstract.ilike(f"%{query_lower}%")) |
+        (Paper.authors.ilike(f"%{query_lower}%"))
+    ).limit(request.limit).all()
+    
+    papers_response = [
+        PaperResponse(
+            id=str(p.id),
+            title=p.title,
+            authors=p.authors,
+            abstract=p.abstract,
+            url=p.pdf_url or '',
+            published=p.published_date.strftime('%Y-%m-%d') if p.published_date else None,
+            category=p.primary_category or 'Unknown'
+        )
+        for p in db_papers
+    ]
+    
+    db_result = {
+        "papers": [p.dict() for p in papers_response],
+        "total": len(papers_response),
+        "search_type": request.search_type,
+        "source": "database"
+    }
+    
+    if db_papers and len(db_papers) >= request.limit:
+        cache.set(cache_key_hash, db_result, ttl=3600)
+        log_search(db, request.query, len(papers_response), request.search_type, current_user, req)
+        
+        yield {**db_result, "cached": False}
+        return
+    
+    if papers_response:
+        yield {**db_result, "partial": True}
+    
+    logger.info("📡 Fetching from ArXiv...")
+    arxiv_papers = fetch_arxiv_papers(query=request.query, max_results=request.limit)
+    
+    if not arxiv_papers:
+        if papers_response:
+            # arXiv added nothing, so the database matches are the full result
+            cache.set(cache_key_hash, db_result, ttl=3600)
+            log_search(db, request.query, len(papers_response), request.search_type, current_user, req)
+            yield {**db_result, "cached": False}
+            return
+        
+        log_search(db, request.query, 0, request.search_type, current_user, req)
+        yield {"papers": [], "total": 0, "search_type": request.search_type, "source": "arxiv", "cached": False}
+        return
+    
+    for paper_data in arxiv_papers:
+        try:
+            arxiv_id = paper_data.get('arxiv_id') or paper_data.get('id', 'unknown')
+            if not db.query(Paper).filter(Paper.arxiv_id == arxiv_id).first():
+                published_date = None
+                if paper_data.get('published'):
+                    try:
+                        published_date = datetime.fromisoformat(paper_data['published'].replace('Z', '+00:00'))
+                    except:
+                        pass
+                
+                new_paper = Paper(
+                    arxiv_id=arxiv_id,
+                    title=paper_data['title'],
+                    authors=paper_data['authors'],
+                    abstract=paper_data['abstract'],
+                    pdf_url=paper_data['url'],
+                    published_date=published_date,
+                    primary_category=paper_data.get('category', 'cs.AI'),
+                    categories=paper_data.get('category', 'cs.AI'),
+                    indexed=True
+                )
+                db.add(new_paper)
+        except:
+            continue
+    
+    try:
+        db.commit()
+    except:
+        db.rollback()
+    
+    papers_response = [PaperResponse(**p) for p in arxiv_papers]
+    result = {
+        "papers": [p.dict() for p in papers_response],
+        "total": len(papers_response),
+        "search_type": request.search_type,
+        "source": "arxiv"
+    }
+    
+    cache.set(cache_key_hash, result, ttl=3600)
+    log_search(db, request.query, len(papers_response), request.search_type, current_user, req)
+    
+    yield {**result, "cached": False}
+
 @router.post("/papers/search", response_model=SearchResponse)
 async def search_papers(
     request: SearchRequest,
@@ -73,102 +201,84 @@ async def search_papers(
     current_user: Optional[User] = Depends(get_current_user)
 ):
     try:
-        logger.info(f"🔍 Search by {current_user.username if current_user else 'guest'}: '{request.query}'")
-        
-        cache_key_hash = hashlib.md5(f"search:{request.query}:{request.limit}".encode()).hexdigest()
-        
-        cached_result = cache.get(cache_key_hash)
-        if cached_result:
-            log_search(db, request.query, cached_result['total'], request.search_type, current_user, req)
-            return SearchResponse(**cached_result, cached=True)
-        
-        query_lower = request.query.lower()
-        db_papers = db.query(Paper).filter(
-            (Paper.title.ilike(f"%{query_lower}%")) |
-            (Paper.abstract.ilike(f"%{query_lower}%")) |
-            (Paper.authors.ilike(f"%{query_lower}%"))
-        ).limit(request.limit).all()
-        
-        if db_papers and len(db_papers) >= request.limit:
-            papers_response = [
-                PaperResponse(
-                    id=str(p.id),
-                    title=p.title,
-                    authors=p.authors,
-                    abstract=p.abstract,
-                    url=p.pdf_url or '',
-                    published=p.published_date.strftime('%Y-%m-%d') if p.published_date else None,
-                    category=p.primary_category or 'Unknown'
-                )
-                for p in db_papers
-            ]
-            
-            result = {
-                "papers": [p.dict() for p in papers_response],
-                "total": len(papers_response),
-                "search_type": request.search_type,
-                "source": "database"
-            }
-            
-            cache.set(cache_key_hash, result, ttl=3600)
-            log_search(db, request.query, len(papers_response), request.search_type, current_user, req)
-            
-            return SearchResponse(**result, cached=False)
-        
-        logger.info("📡 Fetching from ArXiv...")
-        arxiv_papers = fetch_arxiv_papers(query=request.query, max_results=request.limit)
-        
-        if not arxiv_papers:
-            log_search(db, request.query, 0, request.search_type, current_user, req)
-            return SearchResponse(papers=[], total=0, search_type=request.search_type, source="arxiv", cached=False)
-        
-        for paper_data in arxiv_papers:
-            try:
-                arxiv_id = paper_data.get('arxiv_id') or paper_data.get('id', 'unknown')
-                if not db.query(Paper).filter(Paper.arxiv_id == arxiv_id).first():
-                    published_date = None
-                    if paper_data.get('published'):
-                        try:
-                            published_date = datetime.fromisoformat(paper_data['published'].replace('Z', '+00:00'))
-                        except:
-                            pass
-                    
-                    new_paper = Paper(
-                        arxiv_id=arxiv_id,
-                        title=paper_data['title'],
-                        authors=paper_data['authors'],
-                        abstract=paper_data['abstract'],
-                        pdf_url=paper_data['url'],
-                        published_date=published_date,
-                        primary_category=paper_data.get('category', 'cs.AI'),
-                        categories=paper_data.get('category', 'cs.AI'),
-                        indexed=True
-                    )
-                    db.add(new_paper)
-            except:
-                continue
+        for result in _iter_search(request, req, db, current_user):
+            pass
+        return SearchResponse(**result)
         
+    except Exception as e:
+        logger.error(f"Search error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/papers/search/stream")
+def search_papers_stream(
+    request: SearchRequest,
+    req: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user)
+):
+    """
+    Search papers and stream results as Server-Sent Events.
+    
+    Emits a `data: {"papers": [...], "source": "database"}` frame with any
+    database matches while arXiv is still being queried, then a final
+    `data: {"finish_reason": "stop", "papers": [...], "total": ..., ...}`
+    frame (or `{"error": ...}` on failure).
+    """
+    def event_stream():
         try:
-            db.commit()
-        except:
-            db.rollback()
-        
-        papers_response = [PaperResponse(**p) for p in arxiv_papers]
-        result = {
-            "papers": [p.dict() for p in papers_response],
-            "total": len(papers_response),
-            "search_type": request.search_type,
-            "source": "arxiv"
-        }
+            for result in _iter_search(request, req, db, current_user):
+                if result.pop("partial", False):
+                    frame = {"papers": result["papers"], "source": result["source"]}
+                else:
+                    frame = {"finish_reason": "stop", **result}
+                yield f"data: {json.dumps(frame)}\n\n"
+        except Exception as e:
+            logger.error(f"Search stream error: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+def _iter_answer(question: str, db: Session, sources: List[str]) -> Iterator[str]:
+    """Yield the answer text piece by piece, appending each cited source to `sources`"""
+    query_lower = question.lower()
+    papers = db.query(Paper).filter(
+        (Paper.title.ilike(f"%{query_lower}%")) |
+        (Paper.abstract.ilike(f"%{query_lower}%"))
+    ).limit(3).all()
+    
+    if papers:
+        rows = ((p.title, p.pdf_url or '', p.abstract or '') for p in papers)
+    else:
+        arxiv_papers = fetch_arxiv_papers(query=question, max_results=3)
         
-        cache.set(cache_key_hash, result, ttl=3600)
-        log_search(db, request.query, len(papers_response), request.search_type, current_user, req)
+        if not arxiv_papers:
+            yield f"I couldn't find papers related to '{question}'. Try searching for specific topics!"
+            return
         
-        return SearchResponse(**result, cached=False)
+        rows = (
+            (p.get('title', 'Unknown'), p.get('url', ''), p.get('abstract', ''))
+            for p in arxiv_papers
+        )
+    
+    yield f"Based on research about '{question}':\n\n"
+    
+    seen_keys = set()
+    for title, url, abstract in rows:
+        key = (title, url)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
         
-    except Exception as e:
-        logger.error(f"Search error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        sources.append(f"{title} - {url}")
+        yield f"{len(sources)}. **{title}**\n{abstract[:200]}...\n\n"
+        if len(sources) >= 3:
+            break
+    
+    yield "\n\nFor more details, view the full papers in sources."
 
 @router.post("/ask")
 async def ask_question(
@@ -183,39 +293,8 @@ async def ask_question(
         if not question:
             raise HTTPException(status_code=400, detail="No question provided")
         
-        query_lower = question.lower()
-        papers = db.query(Paper).filter(
-            (Paper.title.ilike(f"%{query_lower}%")) |
-            (Paper.abstract.ilike(f"%{query_lower}%"))
-        ).limit(3).all()
-        
-        if not papers:
-            arxiv_papers = fetch_arxiv_papers(query=question, max_results=3)
-            
-            if not arxiv_papers:
-                return {
-                    "answer": f"I couldn't find papers related to '{question}'. Try searching for specific topics!",
-                    "sources": [],
-                    "audio_url": None
-                }
-            
-            answer = f"Based on research about '{question}':\n\n"
-            sources = []
-            
-            for i, paper in enumerate(arxiv_papers[:3], 1):
-                title = paper.get('title', 'Unknown')
-                abstract = paper.get('abstract', '')[:200]
-                answer += f"{i}. **{title}**\n{abstract}...\n\n"
-                sources.append(f"{title} - {paper.get('url', '')}")
-        else:
-            answer = f"Based on research about '{question}':\n\n"
-            sources = []
-            
-            for i, paper in enumerate(papers, 1):
-                answer += f"{i}. **{paper.title}**\n{paper.abstract[:200]}...\n\n"
-                sources.append(f"{paper.title} - {paper.pdf_url or ''}")
-        
-        answer += "\n\nFor more details, view the full papers in sources."
+        sources = []
+        answer = "".join(_iter_answer(question, db, sources))
         
         return {
             "answer": answer,
@@ -227,24 +306,102 @@ async def ask_question(
         logger.error(f"Ask error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/ask/stream")
+def ask_question_stream(
+    request: dict,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user)
+):
+    """
+    Ask a question and stream the answer as Server-Sent Events.
+    
+    Emits `data: {"token": ...}` frames as the answer is produced, then a
+    final `data: {"finish_reason": "stop", "sources": [...], "audio_url": ...}`
+    frame (or `{"error": ...}` on failure).
+    """
+    question = request.get("question", "")
+    
+    if not question:
+        raise HTTPException(status_code=400, detail="No question provided")
+    
+    def event_stream():
+        sources = []
+        try:
+            for token in _iter_answer(question, db, sources):
+                yield f"data: {json.dumps({'token': token})}\n\n"
+            
+            final = {"finish_reason": "stop", "sources": sources, "audio_url": None}
+            yield f"data: {json.dumps(final)}\n\n"
+        except Exception as e:
+            logger.error(f"Ask stream error: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+# Column behind each /papers field; `fields` picks a subset of these
+PAPER_LIST_COLUMNS = {
+    'id': Paper.id,
+    'title': Paper.title,
+    'authors': Paper.authors,
+    'abstract': Paper.abstract,
+    'url': Paper.pdf_url,
+    'published': Paper.published_date,
+    'category': Paper.primary_category,
+}
+
+def _paper_list_value(field: str, value):
+    """Format one selected column the way /papers has always returned it"""
+    if field == 'id':
+        return str(value)
+    if field == 'url':
+        return value or ''
+    if field == 'published':
+        return value.strftime('%Y-%m-%d') if value else None
+    if field == 'category':
+        return value or 'Unknown'
+    return value
+
 @router.get("/papers")
-async def list_papers(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
+async def list_papers(
+    skip: int = 0,
+    limit: int = 50,
+    fields: Optional[str] = None,
+    preview_chars: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    # Only the requested fields leave the database; abstracts can be
+    # cut to a preview there too (e.g. ?fields=title,abstract&preview_chars=250)
+    names = [f.strip() for f in fields.split(',') if f.strip()] if fields else []
+    unknown = [f for f in names if f not in PAPER_LIST_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(PAPER_LIST_COLUMNS)}"
+        )
+    names = names or list(PAPER_LIST_COLUMNS)
+    
     try:
-        total = db.query(Paper).count()
-        papers = db.query(Paper).order_by(Paper.published_date.desc()).offset(skip).limit(limit).all()
+        columns = [PAPER_LIST_COLUMNS[f] for f in names]
+        if preview_chars is not None and 'abstract' in names:
+            columns[names.index('abstract')] = func.substr(Paper.abstract, 1, preview_chars)
+        
+        # Plain COUNT(*) rather than Query.count()'s subquery
+        total = db.scalar(select(func.count()).select_from(Paper))
+        rows = db.execute(
+            select(*columns)
+            .order_by(Paper.published_date.desc())
+            .offset(skip)
+            .limit(limit)
+        ).all()
         
         return {
             "papers": [
-                {
-                    'id': str(p.id),
-                    'title': p.title,
-                    'authors': p.authors,
-                    'abstract': p.abstract,
-                    'url': p.pdf_url or '',
-                    'published': p.published_date.strftime('%Y-%m-%d') if p.published_date else None,
-                    'category': p.primary_category or 'Unknown'
-                }
-                for p in papers
+                {f: _paper_list_value(f, v) for f, v in zip(names, row)}
+                for row in rows
             ],
             "total": total
         }
@@ -254,7 +411,7 @@ async def list_papers(skip: int = 0, limit: int = 50, db: Session = Depends(get_
 @router.get("/papers/stats")
 async def get_stats(db: Session = Depends(get_db)):
     try:
-        total = db.query(Paper).count()
+        total = db.scalar(select(func.count()).select_from(Paper))
         return {
             "total_papers": total,
             "database": "NeonDB",
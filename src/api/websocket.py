@@ -102,6 +102,8 @@ async def handle_ask_streaming(websocket: WebSocket, data: dict):
     try:
         question = data.get("question")
         top_k = data.get("top_k", 5)
+        filter_categories = data.get("filter_categories")
+        paper_ids = data.get("paper_ids")
         
         # Send initial status
         await websocket.send_json({
@@ -111,7 +113,12 @@ async def handle_ask_streaming(websocket: WebSocket, data: dict):
         
         # Search for relevant papers
         search_engine = get_hybrid_search()
-        results = search_engine.search(question, top_k=top_k)
+        results = search_engine.search(
+            question,
+            top_k=top_k,
+            filter_categories=filter_categories,
+            paper_ids=paper_ids
+        )
         
         # Send search results
         await websocket.send_json({
@@ -178,7 +185,12 @@ async def handle_search(websocket: WebSocket, data: dict):
         top_k = data.get("top_k", 10)
         
         search_engine = get_hybrid_search()
-        results = search_engine.search(query, top_k=top_k)
+        results = search_engine.search(
+            query,
+            top_k=top_k,
+            filter_categories=data.get("filter_categories"),
+            paper_ids=data.get("paper_ids")
+        )
         
         await websocket.send_json({
             "type": "search_complete",
@@ -1,9 +1,8 @@
 """
-Speech-to-Text using OpenAI Whisper.
+Speech-to-Text using Whisper (faster-whisper / CTranslate2).
 Converts audio input to text for voice-based queries.
 """
-import whisper
-import torch
+import threading
 from typing import Optional, Union
 import numpy as np
 from pathlib import Path
@@ -11,6 +10,14 @@ import soundfile as sf
 from src.core.logging_config import app_logger
 from src.core.config import settings
 
+# Optional dependency: imported once here rather than per call
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    _WHISPER_OK = True
+except ImportError:
+    _WHISPER_OK = False
+
 
 class SpeechToText:
     """
@@ -21,6 +28,8 @@ class SpeechToText:
     - High accuracy transcription
     - Automatic language detection
     - GPU acceleration
+    - INT8 quantized inference (CTranslate2)
+    - Voice activity detection to skip silence
     """
     
     def __init__(self, model_size: str = "base"):
@@ -30,12 +39,18 @@ class SpeechToText:
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
         """
+        if not _WHISPER_OK:
+            raise ImportError("faster-whisper is not installed; speech-to-text is unavailable")
+        
         self.model_size = model_size
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        self.compute_type = "int8_float16" if self.device == "cuda" else "int8"
         
         try:
-            app_logger.info(f"Loading Whisper model: {model_size} on {self.device}")
-            self.model = whisper.load_model(model_size, device=self.device)
+            app_logger.info(
+                f"Loading Whisper model: {model_size} on {self.device} ({self.compute_type})"
+            )
+            self.model = WhisperModel(model_size, device=self.device, compute_type=self.compute_type)
             app_logger.info("✅ Whisper model loaded successfully")
         except Exception as e:
             app_logger.error(f"❌ Failed to load Whisper model: {e}")
@@ -62,12 +77,7 @@ class SpeechToText:
             app_logger.info(f"Transcribing audio: {audio_path}")
             
             # Transcribe
-            result = self.model.transcribe(
-                str(audio_path),
-                language=language,
-                task=task,
-                fp16=self.device == "cuda"
-            )
+            result = self._transcribe(str(audio_path), language=language, task=task)
             
             app_logger.info(f"✅ Transcription complete: {len(result['text'])} characters")
             
@@ -113,11 +123,7 @@ class SpeechToText:
                 audio_data = self._resample_audio(audio_data, sample_rate, 16000)
             
             # Transcribe
-            result = self.model.transcribe(
-                audio_data,
-                language=language,
-                fp16=self.device == "cuda"
-            )
+            result = self._transcribe(audio_data, language=language)
             
             return {
                 "text": result["text"],
@@ -129,6 +135,37 @@ class SpeechToText:
             app_logger.error(f"Error transcribing audio data: {e}")
             raise
     
+    def _transcribe(
+        self,
+        audio: Union[str, np.ndarray],
+        language: Optional[str] = None,
+        task: str = "transcribe"
+    ) -> dict:
+        """Run the model and collect its lazy segment stream into a result dict."""
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            task=task,
+            beam_size=1,
+            vad_filter=True
+        )
+        
+        segments = [
+            {
+                "start": s.start,
+                "end": s.end,
+                "text": s.text,
+                "no_speech_prob": s.no_speech_prob
+            }
+            for s in segments
+        ]
+        
+        return {
+            "text": "".join(s["text"] for s in segments).strip(),
+            "language": info.language,
+            "segments": segments
+        }
+    
     def _calculate_confidence(self, result: dict) -> float:
         """Calculate average confidence from segments."""
         segments = result.get("segments", [])
@@ -160,15 +197,13 @@ class SpeechToText:
             Detected language code
         """
         try:
-            audio = whisper.load_audio(str(audio_path))
-            audio = whisper.pad_or_trim(audio)
-            
-            mel = whisper.log_mel_spectrogram(audio).to(self.model.device)
+            # Segments are generated lazily, so this only runs language detection
+            _, info = self.model.transcribe(str(audio_path), beam_size=1)
+            detected_lang = info.language
             
-            _, probs = self.model.detect_language(mel)
-            detected_lang = max(probs, key=probs.get)
-            
-            app_logger.info(f"Detected language: {detected_lang} (confidence: {probs[detected_lang]:.2f})")
+            app_logger.info(
+                f"Detected language: {detected_lang} (confidence: {info.language_probability:.2f})"
+            )
             
             return detected_lang
         
@@ -179,12 +214,15 @@ class SpeechToText:
 
 # Global instance
 _speech_to_text: Optional[SpeechToText] = None
+_speech_to_text_lock = threading.Lock()
 
 
 def get_speech_to_text() -> SpeechToText:
-    """Get global speech-to-text instance."""
+    """Get global speech-to-text instance (thread-safe)."""
     global _speech_to_text
     if _speech_to_text is None:
-        model_size = getattr(settings, 'whisper_model_size', 'base')
-        _speech_to_text = SpeechToText(model_size=model_size)
+        with _speech_to_text_lock:
+            if _speech_to_text is None:
+                model_size = getattr(settings, 'whisper_model_size', 'base')
+                _speech_to_text = SpeechToText(model_size=model_size)
     return _speech_to_text
\ No newline at end of file
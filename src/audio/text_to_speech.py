@@ -2,13 +2,26 @@
 Text-to-Speech using Coqui TTS.
 Converts text responses to natural-sounding speech.
 """
-from TTS.api import TTS
-import torch
+import threading
 from typing import Optional, Union
 from pathlib import Path
 import numpy as np
 from src.core.logging_config import app_logger
 
+# Optional dependencies: imported once here rather than per instance
+try:
+    from TTS.api import TTS
+    import torch
+    _COQUI_OK = True
+except ImportError:
+    _COQUI_OK = False
+
+try:
+    from gtts import gTTS
+    _GTTS_OK = True
+except ImportError:
+    _GTTS_OK = False
+
 
 class TextToSpeech:
     """
@@ -28,6 +41,9 @@ class TextToSpeech:
         Args:
             model_name: TTS model name
         """
+        if not _COQUI_OK:
+            raise ImportError("Coqui TTS is not installed")
+        
         self.model_name = model_name
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
@@ -130,7 +146,8 @@ class SimpleTTS:
     
     def __init__(self):
         """Initialize simple TTS."""
-        from gtts import gTTS
+        if not _GTTS_OK:
+            raise ImportError("gTTS is not installed")
         self.gTTS = gTTS
     
     def synthesize_to_file(
@@ -169,15 +186,18 @@ class SimpleTTS:
 
 # Global instance
 _text_to_speech: Optional[TextToSpeech] = None
+_text_to_speech_lock = threading.Lock()
 
 
 def get_text_to_speech() -> TextToSpeech:
-    """Get global text-to-speech instance."""
+    """Get global text-to-speech instance (thread-safe)."""
     global _text_to_speech
     if _text_to_speech is None:
-        try:
-            _text_to_speech = TextToSpeech()
-        except:
-            app_logger.warning("Using simple TTS as fallback")
-            _text_to_speech = SimpleTTS()
+        with _text_to_speech_lock:
+            if _text_to_speech is None:
+                try:
+                    _text_to_speech = TextToSpeech()
+                except:
+                    app_logger.warning("Using simple TTS as fallback")
+                    _text_to_speech = SimpleTTS()
     return _text_to_speech
\ No newline at end of file
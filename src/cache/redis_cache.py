@@ -1,9 +1,10 @@
 ﻿"""Redis caching layer for queries and embeddings."""
 import json
 import pickle
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List
 import redis
 import os
+import threading
 from src.core.logging_config import app_logger
 
 
@@ -86,6 +87,57 @@ class RedisCache:
             app_logger.error(f"Cache set error: {e}")
             return False
     
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values in one round trip (MGET).
+        
+        Args:
+            keys: Cache keys to look up
+        
+        Returns:
+            Dictionary of the keys that were found, mapped to their values
+        """
+        if not keys or not self.is_connected():
+            return {}
+        
+        try:
+            found = {}
+            for key, value in zip(keys, self.client.mget(keys)):
+                if value is None:
+                    continue
+                try:
+                    found[key] = pickle.loads(value)
+                except:
+                    found[key] = value.decode('utf-8')
+            return found
+        except Exception as e:
+            app_logger.error(f"Cache get_many error: {e}")
+            return {}
+    
+    def set_many(self, items: Dict[str, Any], ttl: int = None) -> bool:
+        """
+        Set several values with a TTL in one pipelined round trip.
+        
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds (defaults to default_ttl)
+        
+        Returns:
+            True if every value was written
+        """
+        if not items or not self.is_connected():
+            return False
+        
+        try:
+            ttl = ttl or self.default_ttl
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, pickle.dumps(value))
+            return all(pipe.execute())
+        except Exception as e:
+            app_logger.error(f"Cache set_many error: {e}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
         if not self.is_connected():
@@ -117,10 +169,20 @@ class RedisCache:
             return 0
         
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
+            # SCAN walks the keyspace incrementally instead of blocking Redis
+            # like KEYS; UNLINK frees memory in the background.
+            removed = 0
+            pipe = self.client.pipeline(transaction=False)
+            queued = 0
+            for key in self.client.scan_iter(match=pattern, count=1000):
+                pipe.unlink(key)
+                queued += 1
+                if queued == 500:
+                    removed += sum(pipe.execute())
+                    queued = 0
+            if queued:
+                removed += sum(pipe.execute())
+            return removed
         except Exception as e:
             app_logger.error(f"Cache clear pattern error: {e}")
             return 0
@@ -147,10 +209,13 @@ class RedisCache:
 
 # Global cache instance
 _redis_cache = None
+_redis_cache_lock = threading.Lock()
 
 def get_redis_cache() -> RedisCache:
-    """Get global Redis cache instance."""
+    """Get global Redis cache instance (thread-safe)."""
     global _redis_cache
     if _redis_cache is None:
-        _redis_cache = RedisCache()
+        with _redis_cache_lock:
+            if _redis_cache is None:
+                _redis_cache = RedisCache()
     return _redis_cache
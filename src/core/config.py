@@ -2,7 +2,7 @@
 Core Configuration - Complete Settings
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 import os
 
 class Settings(BaseSettings):
@@ -22,6 +22,16 @@ class Settings(BaseSettings):
     opensearch_host: str = "opensearch"
     opensearch_port: int = 9200
     opensearch_enabled: bool = False
+    # HNSW query-time candidate list size (index.knn.algo_param.ef_search)
+    opensearch_ef_search: int = 100
+    # "fp32" (nmslib) or "fp16" (faiss scalar quantization, OpenSearch >= 2.13)
+    opensearch_vector_encoding: Literal["fp32", "fp16"] = "fp32"
+    
+    # Search caches
+    search_cache_size: int = 512
+    search_cache_threshold: float = 0.97
+    search_cache_ttl: float = 300.0
+    query_embedding_cache_size: int = 2048
     
     # API
     api_host: str = "0.0.0.0"
@@ -4,7 +4,7 @@ Database CRUD operations.
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, select, exists
 from src.database.models import Paper, Chunk, SearchLog, SystemMetrics
 from src.core.logging_config import app_logger
 
@@ -109,7 +109,7 @@ class PaperOperations:
     @staticmethod
     def paper_exists(db: Session, arxiv_id: str) -> bool:
         """Check if paper exists."""
-        return db.query(Paper).filter(Paper.arxiv_id == arxiv_id).count() > 0
+        return db.scalar(select(exists().where(Paper.arxiv_id == arxiv_id)))
 
 
 class ChunkOperations:
@@ -3,7 +3,7 @@ Database sharding implementation for horizontal scaling.
 Distributes data across multiple database instances.
 """
 from typing import Optional, List, Dict, Any
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, func
 from sqlalchemy.orm import sessionmaker, Session
 import hashlib
 from src.core.config import settings
@@ -204,8 +204,8 @@ class ShardManager:
             session = self.get_session(shard_id)
             
             try:
-                paper_count = session.query(Paper).count()
-                chunk_count = session.query(Chunk).count()
+                paper_count = session.scalar(select(func.count()).select_from(Paper))
+                chunk_count = session.scalar(select(func.count()).select_from(Chunk))
                 
                 stats[shard_id] = {
                     "papers": paper_count,
@@ -3,6 +3,7 @@ Embeddings generator using Sentence Transformers.
 Generates vector embeddings for semantic search.
 """
 from typing import List, Optional, Union
+import threading
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from src.core.config import settings
@@ -53,7 +54,12 @@ class EmbeddingsGenerator:
             return np.zeros(self.embedding_dim)
         
         try:
-            embedding = self.model.encode(text, convert_to_numpy=True, show_progress_bar=False)
+            embedding = self.model.encode(
+                text,
+                convert_to_numpy=True,
+                normalize_embeddings=True,  # Unit length, so cosine == inner product
+                show_progress_bar=False
+            )
             return embedding
         except Exception as e:
             app_logger.error(f"Error generating embedding: {e}")
@@ -79,6 +85,7 @@ class EmbeddingsGenerator:
                 texts,
                 batch_size=batch_size,
                 convert_to_numpy=True,
+                normalize_embeddings=True,  # Unit length, so cosine == inner product
                 show_progress_bar=len(texts) > 100
             )
             app_logger.info(f"✅ Generated {len(embeddings)} embeddings")
@@ -152,11 +159,14 @@ class EmbeddingsGenerator:
 
 # Global instance
 _embedding_generator = None
+_embedding_generator_lock = threading.Lock()
 
 
 def get_embedding_generator() -> EmbeddingsGenerator:
-    """Get global embeddings generator instance."""
+    """Get global embeddings generator instance (thread-safe)."""
     global _embedding_generator
     if _embedding_generator is None:
-        _embedding_generator = EmbeddingsGenerator()
+        with _embedding_generator_lock:
+            if _embedding_generator is None:
+                _embedding_generator = EmbeddingsGenerator()
     return _embedding_generator
\ No newline at end of file
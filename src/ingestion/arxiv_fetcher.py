@@ -2,18 +2,52 @@
 Fetch papers from arXiv API.
 """
 import arxiv
+import requests
+import threading
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from src.core.logging_config import app_logger
 
 
+# Shared HTTP session - one keep-alive pool to export.arxiv.org for every fetcher.
+# Each fetcher still builds its own arxiv.Client: the client's 3 s delay between
+# requests is unsynchronised per-client state that sleeps the calling thread, so
+# a shared client would make concurrent API requests wait on each other.
+# The client always requests a full page, so keep it near typical fetch sizes
+# rather than arxiv's default of 100 entries per request.
+ARXIV_PAGE_SIZE = 50
+_arxiv_session: Optional[requests.Session] = None
+_arxiv_session_lock = threading.Lock()
+
+
+def get_arxiv_session() -> requests.Session:
+    """Get global arXiv HTTP session (thread-safe)."""
+    global _arxiv_session
+    if _arxiv_session is None:
+        with _arxiv_session_lock:
+            if _arxiv_session is None:
+                _arxiv_session = requests.Session()
+    return _arxiv_session
+
+
+def create_arxiv_client() -> arxiv.Client:
+    """Create an arXiv client that reuses the shared HTTP session."""
+    client = arxiv.Client(page_size=ARXIV_PAGE_SIZE, num_retries=3)
+    # arxiv 2.1.x sends every request through the private Client._session
+    if hasattr(client, "_session"):
+        client._session = get_arxiv_session()
+    else:
+        app_logger.warning("arxiv.Client has no _session; fetchers will not share an HTTP session")
+    return client
+
+
 class ArxivFetcher:
     """Fetch research papers from arXiv."""
     
     def __init__(self, max_results: int = 100):
         """Initialize arXiv fetcher."""
         self.max_results = max_results
-        self.client = arxiv.Client()
+        self.client = create_arxiv_client()
     
     def fetch_by_category(
         self,
@@ -2,6 +2,7 @@
 Groq LLM Client (Replaces Ollama).
 Fast cloud-based LLM inference using Groq API.
 """
+import io
 from typing import Optional, Dict, Any, List
 from groq import Groq
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -210,7 +211,8 @@ class OllamaClient:
         question: str,
         context: List[Dict[str, Any]],
         system_prompt: Optional[str] = None,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        max_context_length: int = 12000
     ) -> str:
         """
         Generate answer given question and retrieved context.
@@ -220,26 +222,39 @@ class OllamaClient:
             context: List of context documents from retrieval
             system_prompt: System instructions for the AI
             temperature: Sampling temperature (0.3 = more focused)
+            max_context_length: Character budget for the context block
         
         Returns:
             Generated answer
         """
         try:
-            # Build context string from retrieved documents
-            context_parts = []
+            # Build context string from retrieved documents.
+            # Lengths are measured from the pieces so each content string
+            # is copied once, straight into the buffer.
+            buf = io.StringIO()
+            current_length = 0
             for i, doc in enumerate(context[:10]):  # Limit to top 10 to avoid token limits
                 title = doc.get('paper_title', 'Unknown')
                 content = doc.get('content', '')
                 arxiv_id = doc.get('arxiv_id', '')
                 
-                context_parts.append(
-                    f"[Document {i+1}]\n"
+                separator = "\n" if i else ""
+                prefix = (
+                    f"{separator}[Document {i+1}]\n"
                     f"Title: {title}\n"
                     f"arXiv ID: {arxiv_id}\n"
-                    f"Content: {content}\n"
+                    f"Content: "
                 )
+                needed = len(prefix) + len(content) + 1
+                if i and current_length + needed > max_context_length:
+                    break
+                
+                buf.write(prefix)
+                buf.write(content)
+                buf.write("\n")
+                current_length += needed
             
-            context_str = "\n".join(context_parts)
+            context_str = buf.getvalue()
             
             # Build the prompt
             prompt = f"""Context from research papers:
@@ -1,6 +1,5 @@
 """Retrieval module for vector and hybrid search."""
 from src.retrieval.opensearch_client import OpenSearchClient
 from src.retrieval.hybrid_search import HybridSearch
-from src.retrieval.reranker import Reranker
 
-__all__ = ["OpenSearchClient", "HybridSearch", "Reranker"]
\ No newline at end of file
+__all__ = ["OpenSearchClient", "HybridSearch"]
\ No newline at end of file
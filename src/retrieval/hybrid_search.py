@@ -2,14 +2,98 @@
 Hybrid search combining vector and keyword search.
 Uses Reciprocal Rank Fusion (RRF) to merge results.
 """
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+from collections import defaultdict, OrderedDict
+import hashlib
+import threading
+import time
+import numpy as np
 from src.retrieval.opensearch_client import OpenSearchClient, get_opensearch_client
-from src.embeddings.generator import EmbeddingGenerator, get_embedding_generator
+from src.embeddings.generator import EmbeddingsGenerator, get_embedding_generator
 from src.core.config import settings
 from src.core.logging_config import app_logger
 
 
+class _ProximityCache:
+    """
+    Semantic cache of search results keyed on query embedding proximity.
+    
+    A lookup hits when a stored query embedding has cosine similarity
+    >= threshold with the incoming one and was searched with the same
+    parameters. Stored embeddings are kept as unit-norm rows of one
+    contiguous float32 matrix so a lookup is a single matrix-vector product.
+    Eviction is least-recently-used.
+    
+    Papers are indexed by other processes (Celery, Airflow), so entries
+    simply expire ttl seconds after they were stored.
+    """
+    
+    def __init__(self, capacity: int = 512, threshold: float = 0.97, ttl: float = 300.0):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.clear()
+    
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._matrix: Optional[np.ndarray] = None
+            self._entries: List[Optional[Tuple[Any, List[Dict[str, Any]]]]] = [None] * self.capacity
+            self._last_used = np.zeros(self.capacity, dtype=np.int64)
+            self._stored_at = np.zeros(self.capacity, dtype=np.float64)
+            self._size = 0
+            self._tick = 0
+    
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+    
+    def get(self, embedding: np.ndarray, params: Any) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for a near-identical query, or None."""
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            if self._size == 0 or self._matrix.shape[1] != query.shape[0]:
+                return None
+            
+            sims = self._matrix[:self._size] @ query
+            fresh = self._stored_at[:self._size] > time.monotonic() - self.ttl
+            candidates = np.flatnonzero((sims >= self.threshold) & fresh)
+            
+            for idx in candidates[np.argsort(-sims[candidates])]:
+                cached_params, results = self._entries[idx]
+                if cached_params == params:
+                    self._tick += 1
+                    self._last_used[idx] = self._tick
+                    return list(results)
+        
+        return None
+    
+    def put(self, embedding: np.ndarray, params: Any, results: List[Dict[str, Any]]):
+        """Store results for a query embedding, evicting the LRU entry if full."""
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self._matrix = np.zeros((self.capacity, query.shape[0]), dtype=np.float32)
+                self._size = 0
+            
+            if self._size < self.capacity:
+                idx = self._size
+                self._size += 1
+            else:
+                idx = int(np.argmin(self._last_used))
+            
+            self._matrix[idx] = query
+            self._entries[idx] = (params, list(results))
+            self._stored_at[idx] = time.monotonic()
+            self._tick += 1
+            self._last_used[idx] = self._tick
+
+
 class HybridSearch:
     """
     Hybrid search combining vector and keyword search.
@@ -24,7 +108,7 @@ class HybridSearch:
     def __init__(
         self,
         opensearch_client: Optional[OpenSearchClient] = None,
-        embedding_generator: Optional[EmbeddingGenerator] = None
+        embedding_generator: Optional[EmbeddingsGenerator] = None
     ):
         """
         Initialize hybrid search.
@@ -36,13 +120,25 @@ class HybridSearch:
         self.os_client = opensearch_client or get_opensearch_client()
         self.embedding_gen = embedding_generator or get_embedding_generator()
         self.alpha = settings.hybrid_search_alpha  # Weight for vector vs keyword
+        self.cache = _ProximityCache(
+            capacity=settings.search_cache_size,
+            threshold=settings.search_cache_threshold,
+            ttl=settings.search_cache_ttl
+        )
+        
+        # Query embeddings keyed by SHA-256 of the normalized question text
+        self._embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._embedding_cache_size = settings.query_embedding_cache_size
+        self._embedding_lock = threading.RLock()
     
     def search(
         self,
         query: str,
         top_k: int = 10,
         alpha: Optional[float] = None,
-        filter_categories: Optional[List[str]] = None
+        filter_categories: Optional[List[str]] = None,
+        min_vector_score: Optional[float] = None,
+        paper_ids: Optional[List[int]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform hybrid search.
@@ -52,6 +148,8 @@ class HybridSearch:
             top_k: Number of results to return
             alpha: Weight for vector search (0-1), keyword search gets (1-alpha)
             filter_categories: Filter results by paper categories
+            min_vector_score: Minimum KNN score, applied inside OpenSearch
+            paper_ids: Restrict results to these papers
         
         Returns:
             List of merged and ranked results
@@ -61,20 +159,27 @@ class HybridSearch:
             
             alpha = alpha if alpha is not None else self.alpha
             
-            # Prepare filter
-            filter_query = None
-            if filter_categories:
-                filter_query = {
-                    "terms": {"paper_categories": filter_categories}
-                }
+            # Prepare filter (applied inside OpenSearch for both searches)
+            filter_query = self._build_filter(filter_categories, paper_ids)
             
             # 1. Vector search
             app_logger.debug("Performing vector search...")
-            query_embedding = self.embedding_gen.generate_embedding(query)
+            query_embedding = self._embed_query(query)
+            
+            cache_params = (
+                top_k, alpha, tuple(filter_categories or ()), min_vector_score, tuple(paper_ids or ())
+            )
+            cached_results = self.cache.get(query_embedding, cache_params)
+            if cached_results is not None:
+                app_logger.info(f"Hybrid search cache HIT: '{query}'")
+                return cached_results
+            
             vector_results = self.os_client.vector_search(
-                query_vector=query_embedding.tolist(),
+                query_vector=query_embedding,
                 top_k=top_k * 2,  # Retrieve more for fusion
-                filter_query=filter_query
+                filter_query=filter_query,
+                min_score=min_vector_score,
+                as_arrays=True
             )
             
             # 2. Keyword search
@@ -82,20 +187,21 @@ class HybridSearch:
             keyword_results = self.os_client.keyword_search(
                 query_text=query,
                 top_k=top_k * 2,
-                filter_query=filter_query
+                filter_query=filter_query,
+                as_arrays=True
             )
             
-            # 3. Merge using RRF
+            # 3. Merge using RRF and keep top_k results
             app_logger.debug("Merging results with RRF...")
-            merged_results = self._reciprocal_rank_fusion(
+            final_results = self._reciprocal_rank_fusion_arrays(
                 vector_results=vector_results,
                 keyword_results=keyword_results,
                 alpha=alpha,
-                k=60  # RRF parameter
+                k=60,  # RRF parameter
+                top_k=top_k
             )
             
-            # 4. Return top_k results
-            final_results = merged_results[:top_k]
+            self.cache.put(query_embedding, cache_params, final_results)
             
             app_logger.info(f"Hybrid search returned {len(final_results)} results")
             
@@ -105,6 +211,57 @@ class HybridSearch:
             app_logger.error(f"Error in hybrid search: {e}")
             raise
     
+    @staticmethod
+    def _build_filter(
+        filter_categories: Optional[List[str]] = None,
+        paper_ids: Optional[List[int]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Build OpenSearch filter clauses for category/paper restrictions."""
+        clauses = []
+        if filter_categories:
+            clauses.append({"terms": {"paper_categories": filter_categories}})
+        if paper_ids:
+            clauses.append({"terms": {"paper_id": paper_ids}})
+        return clauses or None
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a query, reusing the vector for repeated question text.
+        
+        Args:
+            query: Search query
+        
+        Returns:
+            Query embedding as unit-length float32 array
+        """
+        key = hashlib.sha256(query.strip().lower().encode('utf-8')).digest()
+        
+        with self._embedding_lock:
+            embedding = self._embedding_cache.get(key)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(key)
+                return embedding
+        
+        embedding = np.asarray(
+            self.embedding_gen.generate_query_embedding(query), dtype=np.float32
+        )
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            # All-zero vector means the model failed; don't pin it in the cache
+            return embedding
+        embedding /= norm
+        
+        with self._embedding_lock:
+            self._embedding_cache[key] = embedding
+            while len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+        
+        return embedding
+    
+    def clear_cache(self):
+        """Drop cached search results in this process (they also expire on their own)."""
+        self.cache.clear()
+    
     def _reciprocal_rank_fusion(
         self,
         vector_results: List[Dict[str, Any]],
@@ -157,6 +314,66 @@ class HybridSearch:
         
         return merged_results
     
+    @staticmethod
+    def _reciprocal_rank_fusion_arrays(
+        vector_results: Dict[str, Any],
+        keyword_results: Dict[str, Any],
+        alpha: float = 0.5,
+        k: int = 60,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vectorized RRF over columnar results (see OpenSearchClient._hits_to_arrays).
+        
+        Produces the same results as _reciprocal_rank_fusion, but the scores
+        are accumulated with numpy and result dicts are only built for the
+        top_k survivors.
+        
+        Args:
+            vector_results: Columnar results from vector search
+            keyword_results: Columnar results from keyword search
+            alpha: Weight for vector results (0-1)
+            k: RRF constant (typically 60)
+            top_k: Number of results to materialize (all if None)
+        
+        Returns:
+            Merged and ranked results
+        """
+        n_vec = len(vector_results['chunk_ids'])
+        n_kw = len(keyword_results['chunk_ids'])
+        if n_vec + n_kw == 0:
+            return []
+        
+        chunk_ids = np.concatenate([vector_results['chunk_ids'], keyword_results['chunk_ids']])
+        scores = np.concatenate([vector_results['scores'], keyword_results['scores']])
+        contributions = np.concatenate([
+            alpha * (1.0 / (k + np.arange(1, n_vec + 1))),
+            (1 - alpha) * (1.0 / (k + np.arange(1, n_kw + 1)))
+        ])
+        docs = vector_results['docs'] + keyword_results['docs']
+        
+        _, first_seen, inverse = np.unique(chunk_ids, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        fused = np.zeros(len(first_seen))
+        np.add.at(fused, inverse, contributions)
+        
+        # Like the dict version, a chunk's row is its last vector hit, or its
+        # first keyword hit when vector search did not return it
+        row = first_seen.copy()
+        np.maximum.at(row, inverse[:n_vec], np.arange(n_vec))
+        
+        # Highest score first; ties keep first-seen order
+        order = np.lexsort((first_seen, -fused))[:top_k]
+        
+        return [
+            {
+                'score': float(scores[row[j]]),
+                **docs[row[j]],
+                'hybrid_score': float(fused[j])
+            }
+            for j in order
+        ]
+    
     def explain_search(self, query: str, top_k: int = 5) -> Dict[str, Any]:
         """
         Get detailed explanation of search results.
@@ -170,10 +387,10 @@ class HybridSearch:
         """
         try:
             # Get results from both methods
-            query_embedding = self.embedding_gen.generate_embedding(query)
+            query_embedding = self._embed_query(query)
             
             vector_results = self.os_client.vector_search(
-                query_vector=query_embedding.tolist(),
+                query_vector=query_embedding,
                 top_k=top_k
             )
             
@@ -208,11 +425,14 @@ class HybridSearch:
 
 # Global hybrid search instance
 _hybrid_search: Optional[HybridSearch] = None
+_hybrid_search_lock = threading.Lock()
 
 
 def get_hybrid_search() -> HybridSearch:
-    """Get or create global hybrid search instance."""
+    """Get or create global hybrid search instance (thread-safe)."""
     global _hybrid_search
     if _hybrid_search is None:
-        _hybrid_search = HybridSearch()
+        with _hybrid_search_lock:
+            if _hybrid_search is None:
+                _hybrid_search = HybridSearch()
     return _hybrid_search
\ No newline at end of file
@@ -2,13 +2,25 @@
 OpenSearch client for vector storage and retrieval.
 Handles embedding indexing and vector similarity search.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+import threading
+import numpy as np
 from opensearchpy import OpenSearch, helpers
 from tenacity import retry, stop_after_attempt, wait_exponential
 from src.core.config import settings
 from src.core.logging_config import app_logger
 
 
+# Fields returned per hit - everything except the (large) embedding vector
+KEYWORD_RESULT_FIELDS = [
+    'chunk_id', 'paper_id', 'arxiv_id', 'content', 'paper_title', 'paper_authors'
+]
+VECTOR_RESULT_FIELDS = KEYWORD_RESULT_FIELDS + ['chunk_type']
+
+# Default BM25 fields with boosts, built once rather than per query
+DEFAULT_KEYWORD_FIELDS = ["content^2", "paper_title^1.5", "paper_abstract"]
+
+
 class OpenSearchClient:
     """
     OpenSearch client for vector search operations.
@@ -39,6 +51,12 @@ class OpenSearchClient:
             
             self.index_name = settings.opensearch_index_name
             
+            # HNSW query-time candidate list size (index.knn.algo_param.ef_search)
+            self.ef_search = settings.opensearch_ef_search
+            
+            # "fp32" (nmslib) or "fp16" (faiss scalar quantization, OpenSearch >= 2.13)
+            self.vector_encoding = settings.opensearch_vector_encoding
+            
             # Test connection
             if self.client.ping():
                 app_logger.info("✅ OpenSearch connection successful")
@@ -76,7 +94,7 @@ class OpenSearchClient:
                         "number_of_shards": 2,
                         "number_of_replicas": 1,
                         "knn": True,  # Enable KNN
-                        "knn.algo_param.ef_search": 100  # KNN search parameter
+                        "knn.algo_param.ef_search": self.ef_search  # KNN search parameter
                     }
                 },
                 "mappings": {
@@ -99,15 +117,7 @@ class OpenSearchClient:
                         "embedding": {
                             "type": "knn_vector",
                             "dimension": settings.embedding_dimension,
-                            "method": {
-                                "name": "hnsw",  # Hierarchical Navigable Small World
-                                "space_type": "cosinesimil",  # Cosine similarity
-                                "engine": "nmslib",
-                                "parameters": {
-                                    "ef_construction": 128,
-                                    "m": 16
-                                }
-                            }
+                            "method": self._embedding_method()
                         },
                         
                         # Timestamps
@@ -117,12 +127,54 @@ class OpenSearchClient:
             }
             
             self.client.indices.create(index=index_name, body=index_body)
-            app_logger.info(f"✅ Created index: {index_name}")
+            app_logger.info(f"✅ Created index: {index_name} ({self.vector_encoding} vectors)")
             
         except Exception as e:
             app_logger.error(f"Error creating index: {e}")
             raise
     
+    def _embedding_method(self) -> Dict[str, Any]:
+        """
+        Build the HNSW method definition for the embedding field.
+        
+        Embeddings are L2-normalized when generated, so both engines use
+        the innerproduct space: it ranks identically to cosine but skips
+        the per-comparison norm computation.
+        
+        With fp16 encoding, faiss stores each component as a half float
+        (scalar quantization), halving the bytes read per distance
+        computation. Its ef_search is part of the mapping rather than a
+        dynamic index setting.
+        
+        Returns:
+            knn_vector "method" mapping
+        """
+        if self.vector_encoding == 'fp16':
+            return {
+                "name": "hnsw",
+                "space_type": "innerproduct",
+                "engine": "faiss",
+                "parameters": {
+                    "ef_construction": 128,
+                    "m": 16,
+                    "ef_search": self.ef_search,
+                    "encoder": {
+                        "name": "sq",
+                        "parameters": {"type": "fp16"}
+                    }
+                }
+            }
+        
+        return {
+            "name": "hnsw",  # Hierarchical Navigable Small World
+            "space_type": "innerproduct",  # Cosine similarity on unit vectors
+            "engine": "nmslib",
+            "parameters": {
+                "ef_construction": 128,
+                "m": 16
+            }
+        }
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10)
@@ -219,11 +271,13 @@ class OpenSearchClient:
     )
     def vector_search(
         self,
-        query_vector: List[float],
+        query_vector: Union[np.ndarray, List[float]],
         top_k: int = 10,
-        filter_query: Optional[Dict] = None,
-        index_name: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        filter_query: Optional[Union[Dict, List[Dict]]] = None,
+        index_name: Optional[str] = None,
+        min_score: Optional[float] = None,
+        as_arrays: bool = False
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Perform vector similarity search.
         
@@ -232,6 +286,8 @@ class OpenSearchClient:
             top_k: Number of results to return
             filter_query: Optional filter query
             index_name: Name of the index
+            min_score: Drop hits scoring below this server-side
+            as_arrays: Return columnar arrays (see _hits_to_arrays) instead of dicts
         
         Returns:
             List of search results with scores
@@ -239,56 +295,80 @@ class OpenSearchClient:
         index_name = index_name or self.index_name
         
         try:
-            query = {
-                "size": top_k,
-                "query": {
-                    "knn": {
-                        "embedding": {
-                            "vector": query_vector,
-                            "k": top_k
-                        }
-                    }
-                }
-            }
-            
-            # Add filter if provided
-            if filter_query:
-                query["query"] = {
-                    "bool": {
-                        "must": [query["query"]],
-                        "filter": filter_query
-                    }
-                }
-            
+            query = self._build_vector_query(query_vector, top_k, filter_query, min_score)
             response = self.client.search(index=index_name, body=query)
-            
-            results = []
-            for hit in response['hits']['hits']:
-                result = {
-                    'score': hit['_score'],
-                    'chunk_id': hit['_source']['chunk_id'],
-                    'paper_id': hit['_source']['paper_id'],
-                    'arxiv_id': hit['_source']['arxiv_id'],
-                    'content': hit['_source']['content'],
-                    'paper_title': hit['_source']['paper_title'],
-                    'paper_authors': hit['_source']['paper_authors'],
-                    'chunk_type': hit['_source']['chunk_type']
-                }
-                results.append(result)
-            
-            return results
+            if as_arrays:
+                return self._hits_to_arrays(response)
+            return self._parse_vector_hits(response)
             
         except Exception as e:
             app_logger.error(f"Error in vector search: {e}")
             raise
     
+    @staticmethod
+    def _build_vector_query(
+        query_vector: Union[np.ndarray, List[float]],
+        top_k: int,
+        filter_query: Optional[Union[Dict, List[Dict]]] = None,
+        min_score: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Build a KNN query body."""
+        query = {
+            "size": top_k,
+            "_source": VECTOR_RESULT_FIELDS,
+            "query": {
+                "knn": {
+                    "embedding": {
+                        "vector": OpenSearchClient._vector_payload(query_vector),
+                        "k": top_k
+                    }
+                }
+            }
+        }
+        
+        # Add filter if provided
+        if filter_query:
+            query["query"] = {
+                "bool": {
+                    "must": [query["query"]],
+                    "filter": filter_query
+                }
+            }
+        
+        # Threshold in the engine so weak neighbours never reach Python
+        if min_score is not None:
+            query["min_score"] = min_score
+        
+        return query
+    
+    @staticmethod
+    def _vector_payload(vector: Union[np.ndarray, List[float]]) -> List[float]:
+        """
+        Convert a query vector to its JSON payload in one vectorized pass.
+        
+        Rounding to 6 decimals (well below float32 embedding noise) keeps each
+        component's shortest repr ~9 chars instead of ~19, roughly halving
+        the bytes serialized here and parsed by OpenSearch.
+        """
+        return np.round(np.asarray(vector, dtype=np.float64), 6).tolist()
+    
+    @staticmethod
+    def _parse_vector_hits(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a KNN search response into result dictionaries."""
+        return [
+            {'score': hit['_score'], **hit['_source']}
+            for hit in response['hits']['hits']
+        ]
+    
     def keyword_search(
         self,
         query_text: str,
         top_k: int = 10,
         fields: Optional[List[str]] = None,
-        index_name: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        index_name: Optional[str] = None,
+        filter_query: Optional[Union[Dict, List[Dict]]] = None,
+        as_arrays: bool = False
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Perform keyword-based search using BM25.
         
@@ -297,46 +377,86 @@ class OpenSearchClient:
             top_k: Number of results
             fields: Fields to search in
             index_name: Name of the index
+            filter_query: Optional filter query
+            as_arrays: Return columnar arrays (see _hits_to_arrays) instead of dicts
         
         Returns:
             List of search results
         """
         index_name = index_name or self.index_name
-        fields = fields or ["content^2", "paper_title^1.5", "paper_abstract"]
         
         try:
-            query = {
-                "size": top_k,
-                "query": {
-                    "multi_match": {
-                        "query": query_text,
-                        "fields": fields,
-                        "type": "best_fields"
-                    }
-                }
-            }
-            
+            query = self._build_keyword_query(query_text, top_k, fields, filter_query)
             response = self.client.search(index=index_name, body=query)
-            
-            results = []
-            for hit in response['hits']['hits']:
-                result = {
-                    'score': hit['_score'],
-                    'chunk_id': hit['_source']['chunk_id'],
-                    'paper_id': hit['_source']['paper_id'],
-                    'arxiv_id': hit['_source']['arxiv_id'],
-                    'content': hit['_source']['content'],
-                    'paper_title': hit['_source']['paper_title'],
-                    'paper_authors': hit['_source']['paper_authors'],
-                }
-                results.append(result)
-            
-            return results
+            if as_arrays:
+                return self._hits_to_arrays(response)
+            return self._parse_keyword_hits(response)
             
         except Exception as e:
             app_logger.error(f"Error in keyword search: {e}")
             raise
     
+    @staticmethod
+    def _build_keyword_query(
+        query_text: str,
+        top_k: int,
+        fields: Optional[List[str]] = None,
+        filter_query: Optional[Union[Dict, List[Dict]]] = None
+    ) -> Dict[str, Any]:
+        """Build a BM25 multi-match query body."""
+        query = {
+            "size": top_k,
+            "_source": KEYWORD_RESULT_FIELDS,
+            "query": {
+                "multi_match": {
+                    "query": query_text,
+                    "fields": fields or DEFAULT_KEYWORD_FIELDS,
+                    "type": "best_fields"
+                }
+            }
+        }
+        
+        # Add filter if provided
+        if filter_query:
+            query["query"] = {
+                "bool": {
+                    "must": [query["query"]],
+                    "filter": filter_query
+                }
+            }
+        
+        return query
+    
+    @staticmethod
+    def _parse_keyword_hits(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a BM25 search response into result dictionaries."""
+        return [
+            {'score': hit['_score'], **hit['_source']}
+            for hit in response['hits']['hits']
+        ]
+    
+    @staticmethod
+    def _hits_to_arrays(response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a search response into columnar (structure-of-arrays) form.
+        
+        Returns:
+            Dict with 'scores' (float64[N]), 'chunk_ids' (int64[N]) and
+            'docs' (list of N _source dicts), all in rank order
+        """
+        hits = response['hits']['hits']
+        n = len(hits)
+        scores = np.empty(n, dtype=np.float64)
+        chunk_ids = np.empty(n, dtype=np.int64)
+        docs = []
+        for i, hit in enumerate(hits):
+            source = hit['_source']
+            scores[i] = hit['_score']
+            chunk_ids[i] = source['chunk_id']
+            docs.append(source)
+        
+        return {'scores': scores, 'chunk_ids': chunk_ids, 'docs': docs}
+    
     def delete_by_paper_id(self, paper_id: int, index_name: Optional[str] = None):
         """Delete all chunks for a paper."""
         index_name = index_name or self.index_name
@@ -377,11 +497,14 @@ class OpenSearchClient:
 
 # Global OpenSearch client instance
 _opensearch_client: Optional[OpenSearchClient] = None
+_opensearch_client_lock = threading.Lock()
 
 
 def get_opensearch_client() -> OpenSearchClient:
-    """Get or create global OpenSearch client."""
+    """Get or create global OpenSearch client (thread-safe)."""
     global _opensearch_client
     if _opensearch_client is None:
-        _opensearch_client = OpenSearchClient()
+        with _opensearch_client_lock:
+            if _opensearch_client is None:
+                _opensearch_client = OpenSearchClient()
     return _opensearch_client
\ No newline at end of file
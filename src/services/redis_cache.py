@@ -2,6 +2,7 @@
 import os
 import redis
 import json
+import threading
 from typing import Any, Optional
 from src.core.logging_config import app_logger as logger
 
@@ -78,10 +79,20 @@ class RedisCache:
         if not self.client:
             return 0
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
+            # SCAN walks the keyspace incrementally instead of blocking Redis
+            # like KEYS; UNLINK frees memory in the background.
+            removed = 0
+            pipe = self.client.pipeline(transaction=False)
+            queued = 0
+            for key in self.client.scan_iter(match=pattern, count=1000):
+                pipe.unlink(key)
+                queued += 1
+                if queued == 500:
+                    removed += sum(pipe.execute())
+                    queued = 0
+            if queued:
+                removed += sum(pipe.execute())
+            return removed
         except Exception as e:
             logger.error(f"Redis clear pattern error: {e}")
             return 0
@@ -89,12 +100,15 @@ class RedisCache:
 
 # Singleton instance
 _redis_cache = None
+_redis_cache_lock = threading.Lock()
 
 def get_redis_cache() -> RedisCache:
-    """Get Redis cache instance."""
+    """Get Redis cache instance (thread-safe)."""
     global _redis_cache
     if _redis_cache is None:
-        _redis_cache = RedisCache()
+        with _redis_cache_lock:
+            if _redis_cache is None:
+                _redis_cache = RedisCache()
     return _redis_cache
 
 # Export for backward compatibility
@@ -1,20 +1,46 @@
 ﻿"""
 Text-to-Speech Service using gTTS
 """
-from gtts import gTTS
 import os
+import re
+import time
 import logging
 from pathlib import Path
 import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Optional dependency: without it the service returns no audio
+try:
+    from gtts import gTTS
+    _GTTS_OK = True
+except ImportError:
+    _GTTS_OK = False
+
+# Markdown markers that should not be read aloud
+_MARKDOWN_RE = re.compile(r"[*#]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def clean_text_for_speech(text: str) -> str:
+    """Strip markdown markers, turn paragraph breaks into pauses and collapse whitespace"""
+    text = _MARKDOWN_RE.sub("", text.replace("\n\n", ". "))
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
 class TTSService:
     """Google Text-to-Speech service"""
     
-    def __init__(self, audio_dir: str = "/tmp/audio"):
+    def __init__(
+        self,
+        audio_dir: str = "/tmp/audio",
+        max_cache_mb: int = 200,
+        prune_every: int = 20
+    ):
         self.audio_dir = Path(audio_dir)
         self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.max_cache_bytes = max_cache_mb * 1024 * 1024
+        self.prune_every = prune_every
+        self._generated = 0
         logger.info(f"TTS Service initialized. Audio dir: {self.audio_dir}")
     
     def generate_audio(self, text: str, lang: str = "en") -> str:
@@ -29,35 +55,77 @@ class TTSService:
             Path to generated audio file
         """
         try:
-            # Create hash of text for filename
-            text_hash = hashlib.md5(text.encode()).hexdigest()[:16]
+            clean_text = clean_text_for_speech(text) if text else ""
+            
+            # Nothing worth a network round trip
+            if not clean_text:
+                return None
+            
+            # Limit text length for TTS (max 5000 chars)
+            if len(clean_text) > 5000:
+                clean_text = clean_text[:5000] + "... (truncated for audio)"
+            
+            # Name the file after what is actually spoken, so repeated
+            # answers map to the same MP3
+            text_hash = hashlib.sha256(f"{lang}:{clean_text}".encode()).hexdigest()[:16]
             audio_file = self.audio_dir / f"tts_{text_hash}.mp3"
             
             # Check if already exists
             if audio_file.exists():
+                audio_file.touch()  # Mark as recently used for pruning
                 logger.info(f"Using cached audio: {audio_file}")
                 return str(audio_file)
             
-            # Generate audio
-            logger.info(f"Generating TTS audio for {len(text)} chars...")
+            if not _GTTS_OK:
+                logger.warning("gTTS is not installed; skipping audio generation")
+                return None
             
-            # Limit text length for TTS (max 5000 chars)
-            if len(text) > 5000:
-                text = text[:5000] + "... (truncated for audio)"
+            # Generate audio
+            logger.info(f"Generating TTS audio for {len(clean_text)} chars...")
             
-            tts = gTTS(text=text, lang=lang, slow=False)
+            tts = gTTS(text=clean_text, lang=lang, slow=False)
             tts.save(str(audio_file))
             
             logger.info(f"✅ Audio generated: {audio_file}")
+            
+            self._generated += 1
+            if self._generated % self.prune_every == 0:
+                self.prune_cache()
+            
             return str(audio_file)
             
         except Exception as e:
             logger.error(f"❌ TTS generation failed: {e}")
             return None
     
+    def prune_cache(self):
+        """Remove least recently used audio files until the cache fits max_cache_bytes"""
+        try:
+            files = []
+            total = 0
+            for file in self.audio_dir.glob("tts_*.mp3"):
+                stat = file.stat()
+                files.append((stat.st_mtime, stat.st_size, file))
+                total += stat.st_size
+            
+            if total <= self.max_cache_bytes:
+                return
+            
+            removed = 0
+            for _, size, file in sorted(files):
+                file.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+                if total <= self.max_cache_bytes:
+                    break
+            
+            logger.info(f"Pruned {removed} audio files to stay under cache size cap")
+            
+        except Exception as e:
+            logger.error(f"Cache pruning failed: {e}")
+    
     def cleanup_old_files(self, max_age_hours: int = 24):
         """Remove audio files older than max_age_hours"""
-        import time
         try:
             current_time = time.time()
             removed = 0
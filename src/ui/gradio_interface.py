@@ -1,101 +1,298 @@
 ﻿"""
 Research Paper Curator UI - WITH ASK QUESTION + TTS/STT
 """
-import gradio as gr
-import requests
+import httpx
+import asyncio
+import orjson  # faster than json for bodies and SSE frames
+import time
+import html
+import hashlib
+import random
+import threading
 import os
+import sys
+from collections import OrderedDict
+
+# Optional dependency: without it answers are simply not cached
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 API_HOST = os.getenv("API_HOST", "http://localhost:8000")
 API_HOST = API_HOST.rstrip('/')
 
-print(f"="*70)
-print(f"🔗 API URL: {API_HOST}")
-print(f"="*70)
+# Shared async client: handlers run on Gradio's event loop and reuse
+# keep-alive connections to the API. The transport retries failed connects.
+# httpx's default Accept-Encoding already offers every encoding it can
+# decode (gzip, deflate, and br when brotli is installed).
+http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(120.0),
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=20, keepalive_expiry=60),
+    transport=httpx.AsyncHTTPTransport(retries=2),
+    headers={"Accept": "application/json"}
+)
 
-def search_papers(query, limit, search_type):
-    """Search papers"""
-    if not query:
-        return "⚠️ Please enter a search query."
+# Transient gateway errors on idempotent requests are retried with jittered
+# exponential backoff
+RETRY_METHODS = {"GET"}
+RETRY_STATUSES = {502, 503, 504}
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_AFTER_MAX = 10.0
+
+# Minimum seconds between streamed UI updates; tokens in between are coalesced
+STREAM_UPDATE_INTERVAL = 0.05
+
+# Seconds a successful response is reused for repeat clicks
+BROWSE_CACHE_TTL = 30.0
+_response_cache = {}
+
+# Rendered search results, LRU by normalized query, reused for SEARCH_CACHE_TTL seconds
+SEARCH_CACHE_TTL = 300.0
+SEARCH_CACHE_SIZE = 256
+_search_cache = OrderedDict()
+
+# Browse cards show these fields only, with abstracts cut to a preview
+BROWSE_FIELDS = "title,authors,abstract,url"
+BROWSE_ABSTRACT_CHARS = 250
+
+# /health is probed in the background; check_status returns the latest result
+STATUS_REFRESH_INTERVAL = 10.0
+_status = {"text": "⏳ Checking API status...", "last_ok": None, "body": None}
+_status_thread = None
+_status_lock = threading.Lock()
+
+# Answers to repeat questions are served from Redis for ASK_CACHE_TTL seconds
+REDIS_URL = os.getenv("REDIS_URL")
+ASK_CACHE_TTL = 600
+_redis = aioredis.from_url(REDIS_URL, decode_responses=True) if aioredis and REDIS_URL else None
+
+# Static replies for input the API cannot answer
+_EMPTY_QUESTION_MSG = "⚠️ Please enter a question or record audio."
+_STT_PENDING_MSG = """⚠️ Voice questions are not supported yet.
+
+Please type your question instead."""
+
+def _retry_delay(response, attempt):
+    """Seconds to wait before the next attempt: Retry-After if given, else jittered backoff"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), RETRY_AFTER_MAX)
+    return RETRY_BACKOFF * 2 ** attempt * (0.5 + random.random())
+
+async def _send(method, url, *, timeout, stream=False, **kwargs):
+    """
+    Send a request, retrying 502/503/504 GET responses up to RETRY_TOTAL times.
     
+    A gateway error does not prove the API never saw the request, so POSTs
+    are sent once; only failed connects are retried for them (by the
+    transport). Timeouts are not retried, so the per-call timeout still
+    bounds each attempt. With stream=True the caller must close the
+    returned response.
+    """
+    request = http_client.build_request(method, url, timeout=timeout, **kwargs)
+    attempts = RETRY_TOTAL if method in RETRY_METHODS else 0
+    for attempt in range(attempts + 1):
+        response = await http_client.send(request, stream=stream)
+        if response.status_code not in RETRY_STATUSES or attempt == attempts:
+            return response
+        delay = _retry_delay(response, attempt)
+        await response.aclose()
+        await asyncio.sleep(delay)
+
+async def _get_json_cached(url, timeout, ttl):
+    """GET a JSON endpoint, reusing a successful response for ttl seconds.
+    
+    Returns (status_code, data); data is None unless the status is 200.
+    """
+    now = time.monotonic()
+    hit = _response_cache.get(url)
+    if hit and now - hit[0] < ttl:
+        return 200, hit[1]
+    
+    response = await _send("GET", url, timeout=timeout)
+    if response.status_code != 200:
+        return response.status_code, None
+    
+    data = orjson.loads(response.content)
+    _response_cache[url] = (now, data)
+    return 200, data
+
+def _ask_cache_key(question):
+    """Cache key for a question, ignoring case and whitespace differences"""
+    normalized = " ".join(question.lower().split())
+    return "ui:ask:" + hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+async def _ask_cache_get(key):
+    """Return a cached {answer, sources, audio_url} dict, or None"""
+    if _redis is None:
+        return None
     try:
-        url = f"{API_HOST}/papers/search"
-        response = requests.post(
-            url,
-            json={"query": query, "limit": limit, "search_type": search_type},
-            timeout=60
-        )
-        
-        if response.status_code != 200:
-            return f"❌ API Error: Status {response.status_code}"
-        
-        result = response.json()
-        papers = result.get("papers", [])
-        
-        if not papers:
-            return f"📭 No papers found for '{query}'"
-        
-        html = f"""
+        raw = await _redis.get(key)
+        return orjson.loads(raw) if raw else None
+    except Exception:
+        return None
+
+async def _ask_cache_set(key, value):
+    """Store an answer; cache failures never affect the response"""
+    if _redis is None:
+        return
+    try:
+        await _redis.set(key, orjson.dumps(value), ex=ASK_CACHE_TTL)
+    except Exception:
+        pass
+
+# Header and row templates for paper lists, rendered with str.format_map
+_SEARCH_HEADER_TMPL = """
         <div style='padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 12px; margin-bottom: 20px;'>
-            <h2 style='color: white; margin: 0;'>Found {len(papers)} papers</h2>
+            <h2 style='color: white; margin: 0;'>Found {count} papers</h2>
         </div>
         """
-        
-        for i, paper in enumerate(papers, 1):
-            html += f"""
+
+_SEARCH_PENDING_NOTE = """
+        <p style='color: #6b46c1;'>⏳ Showing database matches - searching arXiv for more...</p>
+        """
+
+_BROWSE_HEADER_TMPL = """
+        <div style='padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 12px;'>
+            <h2 style='color: white;'>📚 {count} Papers</h2>
+        </div>
+        """
+
+_SEARCH_ROW_TMPL = """
             <div style='border: 2px solid #8b5cf6; padding: 20px; margin: 15px 0; border-radius: 10px; background: #f5f3ff;'>
-                <h3 style='color: #6b46c1;'>{i}. {paper.get('title', 'No title')}</h3>
-                <p style='color: #7c3aed;'><strong>Authors:</strong> {paper.get('authors', 'Unknown')}</p>
-                <p style='color: #1f2937;'>{paper.get('abstract', '')[:500]}...</p>
-                <a href="{paper.get('url', '#')}" target="_blank" style='color: #8b5cf6; font-weight: 600;'>📄 View Paper →</a>
+                <h3 style='color: #6b46c1;'>{i}. {title}</h3>
+                <p style='color: #7c3aed;'><strong>Authors:</strong> {authors}</p>
+                <p style='color: #1f2937;'>{abstract}...</p>
+                <a href="{url}" target="_blank" style='color: #8b5cf6; font-weight: 600;'>📄 View Paper →</a>
+            </div>
+            """
+
+_BROWSE_ROW_TMPL = """
+            <div style='border: 2px solid #c4b5fd; padding: 18px; margin: 12px 0; border-radius: 8px; background: white;'>
+                <h3 style='color: #6b46c1;'>{i}. {title}</h3>
+                <p style='color: #7c3aed;'><strong>Authors:</strong> {authors}</p>
+                <p style='color: #4b5563;'>{abstract}...</p>
+                <a href="{url}" target="_blank" style='color: #8b5cf6;'>View Paper →</a>
             </div>
             """
-        
-        return html
-        
-    except requests.exceptions.ConnectionError:
-        return f"❌ Cannot connect to API at {API_HOST}"
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
 
-def ask_question(text_question, audio_question):
-    """Ask question with text or audio - WITH TTS RESPONSE"""
-    question = text_question
+def _project_papers(papers, abstract_chars):
+    """Look up, truncate and HTML-escape the displayed fields in one pass"""
+    escape = html.escape
+    return [
+        (
+            escape(str(paper.get('title') or 'No title')),
+            escape(str(paper.get('authors') or 'Unknown')),
+            escape((paper.get('abstract') or '')[:abstract_chars]),
+            escape(paper.get('url') or '#'),
+        )
+        for paper in papers
+    ]
+
+def _render_paper_rows(papers, template, abstract_chars):
+    """Render one template row per paper"""
+    render = template.format
+    return [
+        render(i=i, title=title, authors=authors, abstract=abstract, url=url)
+        for i, (title, authors, abstract, url) in enumerate(
+            _project_papers(papers, abstract_chars), 1
+        )
+    ]
+
+def _render_search(papers, pending=False):
+    """Render a search result list; `pending` marks database matches shown while arXiv loads"""
+    parts = [_SEARCH_HEADER_TMPL.format(count=len(papers))]
+    if pending:
+        parts.append(_SEARCH_PENDING_NOTE)
+    parts.extend(_render_paper_rows(papers, _SEARCH_ROW_TMPL, 500))
+    return "".join(parts)
+
+async def search_papers(query, limit, search_type):
+    """Search papers - streams database matches first, then the full result"""
+    if not query:
+        yield "⚠️ Please enter a search query."
+        return
     
-    if audio_question is not None:
-        # TODO: Add speech-to-text processing
-        question = text_question if text_question else "Audio processing not yet implemented"
-    
-    if not question:
-        return "⚠️ Please enter a question or record audio.", None
+    # Case and spacing don't change the results
+    cache_key = (" ".join(query.lower().split()), limit, search_type)
+    hit = _search_cache.get(cache_key)
+    if hit and time.monotonic() - hit[0] < SEARCH_CACHE_TTL:
+        _search_cache.move_to_end(cache_key)
+        yield hit[1]
+        return
     
     try:
-        url = f"{API_HOST}/ask"
-        response = requests.post(
+        url = f"{API_HOST}/papers/search/stream"
+        # Compression would buffer SSE frames, so ask for the stream as-is
+        response = await _send(
+            "POST",
             url,
-            json={"question": question},
-            timeout=120
+            content=orjson.dumps({"query": query, "limit": limit, "search_type": search_type}),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+                "Accept-Encoding": "identity"
+            },
+            timeout=60,
+            stream=True
         )
+        try:
+            if response.status_code != 200:
+                yield f"❌ API Error: Status {response.status_code}"
+                return
+            
+            result = None
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = orjson.loads(line[6:])
+                
+                if "error" in event:
+                    yield f"❌ Error: {event['error']}"
+                    return
+                if "finish_reason" in event:
+                    result = event
+                    break
+                if event.get("papers"):
+                    yield _render_search(event["papers"], pending=True)
+        finally:
+            await response.aclose()
         
-        if response.status_code == 404:
-            return """⚠️ Ask endpoint not yet implemented on API.
-
-For now, try searching for papers related to your question!""", None
+        if result is None:
+            yield "❌ Error: search stream ended early"
+            return
         
-        if response.status_code != 200:
-            return f"❌ API Error: Status {response.status_code}", None
+        papers = result.get("papers", [])
         
-        result = response.json()
-        answer = result.get("answer", "No answer")
-        sources = result.get("sources", [])
-        audio_url = result.get("audio_url")
+        if not papers:
+            yield f"📭 No papers found for '{query}'"
+            return
+        
+        rendered = _render_search(papers)
         
-        # Format answer
-        formatted_answer = answer.replace('\n', '<br>')
+        _search_cache[cache_key] = (time.monotonic(), rendered)
+        _search_cache.move_to_end(cache_key)
+        if len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
         
-        html = f"""
+        yield rendered
+        
+    except httpx.ConnectError:
+        yield f"❌ Cannot connect to API at {API_HOST}"
+    except Exception as e:
+        yield f"❌ Error: {str(e)}"
+
+def _render_answer(question, answer, sources):
+    """Render the answer card and its sources list, HTML-escaping all text"""
+    escape = html.escape
+    formatted_answer = escape(answer).replace('\n', '<br>')
+    
+    parts = [f"""
         <div style='padding: 25px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 12px; margin-bottom: 20px;'>
             <h2 style='color: white; margin: 0;'>💡 Answer</h2>
-            <p style='color: #e0e7ff; font-size: 14px;'>Question: "{question}"</p>
+            <p style='color: #e0e7ff; font-size: 14px;'>Question: "{escape(question)}"</p>
         </div>
         
         <div style='background: white; padding: 25px; border-radius: 10px; border-left: 6px solid #8b5cf6; margin-bottom: 20px;'>
@@ -107,78 +304,152 @@ For now, try searching for papers related to your question!""", None
         <div style='background: #f5f3ff; padding: 20px; border-radius: 10px; border: 2px solid #c4b5fd;'>
             <h3 style='color: #6b46c1; margin-top: 0;'>📚 Sources</h3>
             <ul style='color: #553c9a;'>
-        """
-        
-        for source in sources:
-            html += f"<li>{source}</li>"
-        
-        html += """
+        """]
+    
+    for source in sources:
+        parts.append(f"<li>{escape(source)}</li>")
+    
+    parts.append("""
             </ul>
         </div>
-        """
+        """)
+    return "".join(parts)
+
+async def ask_question(text_question, audio_question):
+    """Ask question with text or audio - streams the answer, then adds TTS audio"""
+    question = (text_question or "").strip()
+    
+    # Nothing the API could answer - reply without a round trip
+    if not question:
+        yield (_STT_PENDING_MSG if audio_question is not None else _EMPTY_QUESTION_MSG), None
+        return
+    
+    try:
+        cache_key = _ask_cache_key(question)
+        cached = await _ask_cache_get(cache_key)
+        if cached:
+            audio_url = cached.get("audio_url")
+            yield (
+                _render_answer(question, cached["answer"], cached["sources"]),
+                f"{API_HOST}{audio_url}" if audio_url else None
+            )
+            return
         
-        # Handle audio
-        audio_file = None
-        if audio_url:
-            try:
-                audio_file_url = f"{API_HOST}{audio_url}"
-                audio_response = requests.get(audio_file_url, timeout=10)
-                if audio_response.status_code == 200:
-                    import tempfile
-                    temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-                    temp_audio.write(audio_response.content)
-                    temp_audio.close()
-                    audio_file = temp_audio.name
-            except:
-                pass
+        url = f"{API_HOST}/ask/stream"
+        answer_parts = []
+        sources = []
+        audio_url = None
+        finished = False
+        last_emit = time.monotonic()
+        
+        # Compression would buffer SSE frames, so ask for the stream as-is
+        response = await _send(
+            "POST",
+            url,
+            content=orjson.dumps({"question": question}),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+                "Accept-Encoding": "identity"
+            },
+            timeout=120,
+            stream=True
+        )
+        try:
+            if response.status_code == 404:
+                yield """⚠️ Ask endpoint not yet implemented on API.
+
+For now, try searching for papers related to your question!""", None
+                return
+            
+            if response.status_code != 200:
+                yield f"❌ API Error: Status {response.status_code}", None
+                return
+            
+            # Server-Sent Events: one "data: {...}" line per frame
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = orjson.loads(line[6:])
+                
+                if "token" in event:
+                    answer_parts.append(event["token"])
+                    now = time.monotonic()
+                    if now - last_emit >= STREAM_UPDATE_INTERVAL:
+                        yield _render_answer(question, "".join(answer_parts), sources), None
+                        last_emit = now
+                elif "error" in event:
+                    yield f"❌ Error: {event['error']}", None
+                    return
+                else:
+                    sources = event.get("sources", [])
+                    audio_url = event.get("audio_url")
+                    finished = True
+        finally:
+            await response.aclose()
         
-        return html, audio_file
+        answer = "".join(answer_parts) or "No answer"
+        if finished:
+            await _ask_cache_set(
+                cache_key, {"answer": answer, "sources": sources, "audio_url": audio_url}
+            )
+        
+        # Always emitted, so tokens held back by the throttle still land
+        answer_card = _render_answer(question, answer, sources)
         
-    except requests.exceptions.ConnectionError:
-        return f"❌ Cannot connect to API at {API_HOST}", None
+        # Audio player only appears with the final update.
+        # Hand Gradio the URL; it fetches and caches the file itself.
+        audio_file = f"{API_HOST}{audio_url}" if audio_url else None
+        yield answer_card, audio_file
+        
+    except httpx.ConnectError:
+        yield f"❌ Cannot connect to API at {API_HOST}", None
     except Exception as e:
-        return f"❌ Error: {str(e)}", None
+        yield f"❌ Error: {str(e)}", None
 
-def browse_papers(limit):
+async def browse_papers(limit):
     """Browse papers"""
     try:
-        response = requests.get(f"{API_HOST}/papers?limit={limit}", timeout=30)
+        # Let the API send only what the cards show, with abstracts pre-trimmed
+        status_code, result = await _get_json_cached(
+            f"{API_HOST}/papers?limit={limit}&fields={BROWSE_FIELDS}"
+            f"&preview_chars={BROWSE_ABSTRACT_CHARS}",
+            timeout=30,
+            ttl=BROWSE_CACHE_TTL
+        )
         
-        if response.status_code != 200:
-            return f"❌ Error: {response.status_code}"
+        if status_code != 200:
+            return f"❌ Error: {status_code}"
         
-        result = response.json()
         papers = result.get("papers", [])
         
-        html = f"""
-        <div style='padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 12px;'>
-            <h2 style='color: white;'>📚 {len(papers)} Papers</h2>
-        </div>
-        """
+        parts = [_BROWSE_HEADER_TMPL.format(count=len(papers))]
+        parts.extend(_render_paper_rows(papers, _BROWSE_ROW_TMPL, BROWSE_ABSTRACT_CHARS))
         
-        for i, paper in enumerate(papers, 1):
-            html += f"""
-            <div style='border: 2px solid #c4b5fd; padding: 18px; margin: 12px 0; border-radius: 8px; background: white;'>
-                <h3 style='color: #6b46c1;'>{i}. {paper.get('title', 'No title')}</h3>
-                <p style='color: #7c3aed;'><strong>Authors:</strong> {paper.get('authors', 'Unknown')}</p>
-                <p style='color: #4b5563;'>{paper.get('abstract', '')[:250]}...</p>
-                <a href="{paper.get('url', '#')}" target="_blank" style='color: #8b5cf6;'>View Paper →</a>
-            </div>
-            """
-        
-        return html
+        return "".join(parts)
         
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def check_status():
-    """Check API status"""
-    try:
-        response = requests.get(f"{API_HOST}/health", timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return f"""✅ All Systems Operational!
+def _format_status(status_code, data, error=None):
+    """Render the status panel text for one health probe"""
+    if error is not None:
+        last_ok = _status["last_ok"]
+        last_ok_line = (
+            f"Last healthy: {int(time.monotonic() - last_ok)}s ago\n" if last_ok else ""
+        )
+        return f"""❌ Cannot connect to API
+
+URL: {API_HOST}
+Error: {error}
+{last_ok_line}
+Check: docker ps
+"""
+    
+    if status_code != 200:
+        return f"⚠️ API status {status_code}"
+    
+    return f"""✅ All Systems Operational!
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 API Status: {data.get('status', 'unknown').upper()}
@@ -188,126 +459,179 @@ Database: {data.get('database', 'unknown')}
 🔗 API URL: {API_HOST}
 Status: Connected ✅
 """
-        else:
-            return f"⚠️ API status {response.status_code}"
-            
-    except Exception as e:
-        return f"""❌ Cannot connect to API
 
-URL: {API_HOST}
-Error: {str(e)}
+def _refresh_status_forever():
+    """Background loop probing /health so check_status never waits on the API"""
+    with httpx.Client(timeout=3, headers={"Accept": "application/json"}) as client:
+        while True:
+            try:
+                response = client.get(f"{API_HOST}/health")
+                if response.status_code == 200:
+                    _status["last_ok"] = time.monotonic()
+                    # Same payload as last probe: the rendered text still holds
+                    if response.content != _status["body"]:
+                        _status["text"] = _format_status(200, orjson.loads(response.content))
+                        _status["body"] = response.content
+                else:
+                    _status["text"] = _format_status(response.status_code, None)
+                    _status["body"] = None
+            except Exception as e:
+                _status["text"] = _format_status(None, None, error=str(e))
+                _status["body"] = None
+            time.sleep(STATUS_REFRESH_INTERVAL)
 
-Check: docker ps
-"""
+def _start_status_refresher():
+    """Start the health probe thread once"""
+    global _status_thread
+    with _status_lock:
+        if _status_thread is None:
+            _status_thread = threading.Thread(
+                target=_refresh_status_forever, name="ui-health", daemon=True
+            )
+            _status_thread.start()
 
-custom_theme = gr.themes.Soft(
-    primary_hue=gr.themes.colors.purple,
-    secondary_hue=gr.themes.colors.violet,
-)
+async def check_status():
+    """Check API status (served from the background probe)"""
+    _start_status_refresher()
+    return _status["text"]
 
-with gr.Blocks(title="Research Paper Curator", theme=custom_theme) as app:
+def build_app():
+    """
+    Build the Gradio Blocks UI.
     
-    gr.HTML("""
-        <div style='text-align: center; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px; border-radius: 15px; color: white; margin-bottom: 30px;'>
-            <h1 style='font-size: 42px; margin: 0;'>📚 Research Paper Curator</h1>
-            <p style='font-size: 18px; margin: 10px 0;'>Ask questions about AI research papers powered by RAG</p>
-            <p style='font-size: 14px;'>Version 1.0.0 • 🎤 TTS/STT Enabled</p>
-        </div>
-    """)
+    Gradio is imported here so the handlers above can be imported (e.g. by
+    tests) without pulling in Gradio or constructing the interface.
+    
+    Returns:
+        The gr.Blocks app, ready to queue and launch
+    """
+    import gradio as gr
     
-    with gr.Tabs():
+    custom_theme = gr.themes.Soft(
+        primary_hue=gr.themes.colors.purple,
+        secondary_hue=gr.themes.colors.violet,
+    )
+
+    with gr.Blocks(title="Research Paper Curator", theme=custom_theme) as app:
         
-        with gr.Tab("🔍 Search Papers"):
-            gr.Markdown("### Search with Hybrid, Vector, or Keyword methods")
-            
-            search_query = gr.Textbox(
-                label="Search Query",
-                placeholder="e.g., 'large language models', 'transformers'",
-                lines=2
-            )
-            
-            with gr.Row():
-                search_type = gr.Radio(
-                    choices=["hybrid", "vector", "keyword"],
-                    value="hybrid",
-                    label="Search Type"
-                )
-                search_limit = gr.Slider(5, 50, 10, step=5, label="Results")
-            
-            search_btn = gr.Button("🔍 Search Papers", variant="primary", size="lg")
-            search_output = gr.HTML()
-            
-            search_btn.click(
-                fn=search_papers,
-                inputs=[search_query, search_limit, search_type],
-                outputs=search_output
-            )
+        gr.HTML("""
+            <div style='text-align: center; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px; border-radius: 15px; color: white; margin-bottom: 30px;'>
+                <h1 style='font-size: 42px; margin: 0;'>📚 Research Paper Curator</h1>
+                <p style='font-size: 18px; margin: 10px 0;'>Ask questions about AI research papers powered by RAG</p>
+                <p style='font-size: 14px;'>Version 1.0.0 • 🎤 TTS/STT Enabled</p>
+            </div>
+        """)
         
-        with gr.Tab("❓ Ask Questions"):
-            gr.Markdown("### Ask with text OR voice • Get answers in text AND voice!")
-            gr.Markdown("⏱️ **Note:** May take 30-60 seconds for complex questions")
-            
-            with gr.Row():
-                with gr.Column(scale=2):
-                    question_text = gr.Textbox(
-                        label="💬 Type your question",
-                        placeholder="e.g., What are transformers? How do they work?",
-                        lines=3
-                    )
-                with gr.Column(scale=1):
-                    question_audio = gr.Audio(
-                        label="🎤 OR Record",
-                        sources=["microphone"],
-                        type="filepath"
-                    )
+        with gr.Tabs():
             
-            ask_btn = gr.Button("❓ Get Answer", variant="primary", size="lg")
-            
-            gr.Markdown("---")
-            
-            with gr.Row():
-                with gr.Column(scale=3):
-                    answer_html = gr.HTML(label="Answer")
-                with gr.Column(scale=1):
-                    answer_audio = gr.Audio(
-                        label="🔊 Listen",
-                        type="filepath"
+            with gr.Tab("🔍 Search Papers"):
+                gr.Markdown("### Search with Hybrid, Vector, or Keyword methods")
+                
+                search_query = gr.Textbox(
+                    label="Search Query",
+                    placeholder="e.g., 'large language models', 'transformers'",
+                    lines=2
+                )
+                
+                with gr.Row():
+                    search_type = gr.Radio(
+                        choices=["hybrid", "vector", "keyword"],
+                        value="hybrid",
+                        label="Search Type"
                     )
+                    search_limit = gr.Slider(5, 50, 10, step=5, label="Results")
+                
+                search_btn = gr.Button("🔍 Search Papers", variant="primary", size="lg")
+                search_output = gr.HTML()
+                
+                search_btn.click(
+                    fn=search_papers,
+                    inputs=[search_query, search_limit, search_type],
+                    outputs=search_output,
+                    concurrency_id="api"
+                )
             
-            ask_btn.click(
-                fn=ask_question,
-                inputs=[question_text, question_audio],
-                outputs=[answer_html, answer_audio]
-            )
-        
-        with gr.Tab("📚 Browse Papers"):
-            gr.Markdown("### Browse all papers in the database")
+            with gr.Tab("❓ Ask Questions"):
+                gr.Markdown("### Ask with text OR voice • Get answers in text AND voice!")
+                gr.Markdown("⏱️ **Note:** May take 30-60 seconds for complex questions")
+                
+                with gr.Row():
+                    with gr.Column(scale=2):
+                        question_text = gr.Textbox(
+                            label="💬 Type your question",
+                            placeholder="e.g., What are transformers? How do they work?",
+                            lines=3
+                        )
+                    with gr.Column(scale=1):
+                        question_audio = gr.Audio(
+                            label="🎤 OR Record",
+                            sources=["microphone"],
+                            type="filepath"
+                        )
+                
+                ask_btn = gr.Button("❓ Get Answer", variant="primary", size="lg")
+                
+                gr.Markdown("---")
+                
+                with gr.Row():
+                    with gr.Column(scale=3):
+                        answer_html = gr.HTML(label="Answer")
+                    with gr.Column(scale=1):
+                        answer_audio = gr.Audio(
+                            label="🔊 Listen",
+                            type="filepath"
+                        )
+                
+                ask_btn.click(
+                    fn=ask_question,
+                    inputs=[question_text, question_audio],
+                    outputs=[answer_html, answer_audio],
+                    concurrency_limit=8
+                )
             
-            browse_limit = gr.Slider(10, 100, 20, step=10, label="Papers")
-            browse_btn = gr.Button("📚 Load Papers", variant="primary", size="lg")
-            browse_output = gr.HTML()
+            with gr.Tab("📚 Browse Papers"):
+                gr.Markdown("### Browse all papers in the database")
+                
+                browse_limit = gr.Slider(10, 100, 20, step=10, label="Papers")
+                browse_btn = gr.Button("📚 Load Papers", variant="primary", size="lg")
+                browse_output = gr.HTML()
+                
+                browse_btn.click(
+                    fn=browse_papers,
+                    inputs=browse_limit,
+                    outputs=browse_output,
+                    concurrency_id="api"
+                )
             
-            browse_btn.click(
-                fn=browse_papers,
-                inputs=browse_limit,
-                outputs=browse_output
-            )
+            with gr.Tab("⚙️ System"):
+                gr.Markdown("### System Status")
+                
+                status_btn = gr.Button("🏥 Check Status", variant="secondary", size="lg")
+                status_output = gr.Textbox(label="Status", lines=15)
+                
+                status_btn.click(fn=check_status, outputs=status_output)
         
-        with gr.Tab("⚙️ System"):
-            gr.Markdown("### System Status")
-            
-            status_btn = gr.Button("🏥 Check Status", variant="secondary", size="lg")
-            status_output = gr.Textbox(label="Status", lines=15)
-            
-            status_btn.click(fn=check_status, outputs=status_output)
+        # Fill the panel on page load from the background probe (no API call here)
+        app.load(fn=check_status, outputs=status_output)
+    
+    return app
 
 if __name__ == "__main__":
-    print("="*70)
-    print("🚀 Research Paper Curator UI")
-    print(f"📡 API: {API_HOST}")
-    print("🎤 TTS/STT: Enabled")
-    print("="*70)
+    # One write, so the banner can't interleave with Gradio's startup logs
+    banner = [
+        "=" * 70,
+        "🚀 Research Paper Curator UI",
+        f"📡 API: {API_HOST}",
+        "🎤 TTS/STT: Enabled",
+        "=" * 70,
+    ]
+    sys.stdout.write("\n".join(banner) + "\n")
     
+    _start_status_refresher()
+    app = build_app()
+    # Short API calls (search, browse) share one bucket; long answer streams
+    # have their own. max_size rejects new work instead of queueing forever.
+    app.queue(default_concurrency_limit=8, max_size=64)
     app.launch(
         server_name="0.0.0.0",
         server_port=7860,
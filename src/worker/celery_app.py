@@ -1,11 +1,15 @@
 ﻿"""Celery worker for background job processing."""
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 from src.core.logging_config import app_logger
 
 # Get Redis URL from environment
 redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+# Papers processed per worker message in batch jobs
+BATCH_CHUNK_SIZE = 10
+
 # Initialize Celery
 celery_app = Celery(
     "rag_worker",
@@ -15,17 +19,50 @@ celery_app = Celery(
 
 # Configuration
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer='msgpack',
+    accept_content=['json', 'msgpack'],
+    result_serializer='msgpack',
+    result_expires=3600,  # Reap stored results after an hour
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
     task_time_limit=30 * 60,
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # Reuse a bounded pool of long-lived Redis connections per worker
+    broker_pool_limit=32,
+    broker_transport_options={
+        'max_connections': 32,
+        'socket_keepalive': True,
+        'health_check_interval': 30,
+    },
+    result_backend_transport_options={
+        'max_connections': 32,
+        'socket_keepalive': True,
+        'health_check_interval': 30,
+    },
 )
 
+@worker_process_init.connect
+def warm_up_worker(**kwargs):
+    """
+    Load per-process singletons when a worker child starts.
+    
+    Task modules are still imported lazily, but the embedding model and
+    the shared arXiv HTTP session are created here so the first task on each
+    child does not pay model-load latency.
+    """
+    try:
+        from src.embeddings.generator import get_embedding_generator
+        from src.ingestion.arxiv_fetcher import get_arxiv_session
+        
+        get_embedding_generator()
+        get_arxiv_session()
+        app_logger.info("Worker warm-up complete")
+    except Exception as e:
+        # Tasks load what they need on demand if warm-up fails
+        app_logger.warning(f"Worker warm-up failed: {e}")
+
 @celery_app.task(bind=True, max_retries=3)
 def process_paper_async(self, arxiv_id: str):
     """Process a paper in the background."""
@@ -52,15 +89,40 @@ def process_paper_async(self, arxiv_id: str):
         app_logger.error(f"Background task failed: {arxiv_id} - {exc}")
         raise self.retry(exc=exc, countdown=60)
 
+@celery_app.task
+def process_paper_chunk(arxiv_ids: list):
+    """
+    Process several papers in one worker message.
+    
+    Papers run in-process one after another; a paper that fails is
+    re-queued on its own as process_paper_async so it keeps the normal
+    per-paper retry policy without failing the rest of the chunk.
+    """
+    processed = 0
+    for arxiv_id in arxiv_ids:
+        try:
+            process_paper_async(arxiv_id)
+            processed += 1
+        except Exception:
+            process_paper_async.delay(arxiv_id)
+    
+    return {"processed": processed, "requeued": len(arxiv_ids) - processed}
+
 @celery_app.task
 def batch_process_papers(arxiv_ids: list):
     """Process multiple papers in batch."""
     from celery import group
     
-    job = group(process_paper_async.s(arxiv_id) for arxiv_id in arxiv_ids)
+    # Same id twice should only be processed once; keep first-seen order
+    unique_ids = list(dict.fromkeys(arxiv_ids))
+    
+    job = group(
+        process_paper_chunk.s(unique_ids[i:i + BATCH_CHUNK_SIZE])
+        for i in range(0, len(unique_ids), BATCH_CHUNK_SIZE)
+    )
     result = job.apply_async()
     
-    return {"task_id": result.id, "count": len(arxiv_ids)}
+    return {"task_id": result.id, "count": len(unique_ids)}
 
 @celery_app.task
 def cleanup_old_cache():
@@ -0,0 +1,19 @@
+﻿"""
+Shared pytest fixtures.
+Heavy objects are built once per session so every test module reuses them.
+"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    """In-process API client; no uvicorn, no port, no startup sleep."""
+    pytest.importorskip("fastapi")
+    if not os.getenv("DATABASE_URL"):
+        pytest.skip("DATABASE_URL not set (app creates tables on import)")
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    with TestClient(app) as test_client:
+        yield test_client
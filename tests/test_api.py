@@ -0,0 +1,40 @@
+﻿"""
+API tests run in-process through FastAPI's TestClient.
+"""
+import pytest
+
+
+def test_root(client):
+    """Root endpoint reports the API as running."""
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+
+
+def test_health(client):
+    """Health endpoint responds without an external server."""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+@pytest.mark.parametrize("preview_chars", [0, -5])
+def test_papers_rejects_non_positive_preview_chars(client, preview_chars):
+    """A preview length must be at least one character."""
+    response = client.get("/api/papers", params={"preview_chars": preview_chars})
+    assert response.status_code == 422
+
+
+def test_papers_fields_ignore_surrounding_spaces(client):
+    """Requested field names are trimmed before they are matched."""
+    response = client.get("/api/papers", params={"fields": "title, abstract", "limit": 1})
+    assert response.status_code == 200
+    for paper in response.json()["papers"]:
+        assert set(paper) == {"title", "abstract"}
+
+
+def test_papers_rejects_unknown_fields(client):
+    """Unknown field names are reported instead of silently dropped."""
+    response = client.get("/api/papers", params={"fields": "title,bogus"})
+    assert response.status_code == 422
+    assert "bogus" in response.json()["detail"]
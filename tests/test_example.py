@@ -2,22 +2,29 @@
 Example tests for the application.
 Add more tests as you develop features.
 """
+import importlib
+import os
+
 import pytest
 
 
-def test_example():
-    """Basic test to ensure pytest is working."""
-    assert True
+# Cheap checks; deselect with -m "not smoke"
+pytestmark = pytest.mark.smoke
 
 
-def test_imports():
-    """Test that main modules can be imported."""
-    try:
-        from src.api import main
-        from src.services import auth
-        assert True
-    except ImportError as e:
-        pytest.fail(f"Import failed: {e}")
+@pytest.mark.parametrize("module_name, requires, needs_database", [
+    ("src.services.tts_service", [], False),
+    ("src.ui.gradio_interface", ["httpx", "orjson"], False),
+    ("src.services.auth", ["fastapi", "jwt", "passlib"], True),
+    ("src.api.main", ["fastapi", "jwt", "passlib", "email_validator", "arxiv", "redis"], True),
+])
+def test_imports(module_name, requires, needs_database):
+    """Test that main modules import, skipping those whose dependencies are missing."""
+    for dependency in requires:
+        pytest.importorskip(dependency)
+    if needs_database and not os.getenv("DATABASE_URL"):
+        pytest.skip("DATABASE_URL not set (the engine is created on import)")
+    importlib.import_module(module_name)
 
 
 # Add more tests here as you develop features
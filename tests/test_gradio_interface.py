@@ -0,0 +1,113 @@
+﻿"""
+Tests for the Gradio UI's API client helpers and caches.
+"""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("orjson")
+
+from src.ui import gradio_interface as ui
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Route the UI's HTTP client to a handler; returns the list of requests seen."""
+    requests = []
+    responses = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    monkeypatch.setattr(ui, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(ui, "RETRY_BACKOFF", 0)
+    monkeypatch.setattr(ui, "_response_cache", {})
+    monkeypatch.setattr(ui, "_search_cache", ui.OrderedDict())
+    return requests, responses
+
+
+def test_send_retries_get_on_gateway_error(api):
+    """A GET that hits a 503 is sent again."""
+    requests, responses = api
+    responses.extend([httpx.Response(503), httpx.Response(200)])
+
+    response = asyncio.run(ui._send("GET", "http://api/papers", timeout=5))
+
+    assert response.status_code == 200
+    assert len(requests) == 2
+
+
+def test_send_gives_up_after_retry_total(api):
+    """The last gateway error is returned once the retries are spent."""
+    requests, responses = api
+    responses.append(httpx.Response(502))
+
+    response = asyncio.run(ui._send("GET", "http://api/papers", timeout=5))
+
+    assert response.status_code == 502
+    assert len(requests) == ui.RETRY_TOTAL + 1
+
+
+def test_send_does_not_replay_post(api):
+    """A POST is sent once even when the gateway reports an error."""
+    requests, responses = api
+    responses.extend([httpx.Response(503), httpx.Response(200)])
+
+    response = asyncio.run(ui._send("POST", "http://api/ask", timeout=5, content=b"{}"))
+
+    assert response.status_code == 503
+    assert len(requests) == 1
+
+
+def test_get_json_cached_reuses_response(api):
+    """Repeat GETs within the TTL are served without a request."""
+    requests, responses = api
+    responses.append(httpx.Response(200, json={"total": 3}))
+
+    first = asyncio.run(ui._get_json_cached("http://api/papers", timeout=5, ttl=30))
+    second = asyncio.run(ui._get_json_cached("http://api/papers", timeout=5, ttl=30))
+
+    assert first == second == (200, {"total": 3})
+    assert len(requests) == 1
+
+
+def _collect(agen):
+    async def run():
+        return [item async for item in agen]
+    return asyncio.run(run())
+
+
+def test_search_results_cached_by_normalized_query(api):
+    """A repeat search differing only in case and spacing skips the API."""
+    requests, responses = api
+    paper = {"title": "Attention", "authors": "Vaswani", "abstract": "Transformers", "url": "http://x"}
+    responses.append(httpx.Response(
+        200,
+        content=b'data: {"finish_reason": "stop", "papers": [' + ui.orjson.dumps(paper) + b']}\n\n',
+        headers={"Content-Type": "text/event-stream"}
+    ))
+
+    first = _collect(ui.search_papers("Attention", 10, "hybrid"))
+    second = _collect(ui.search_papers("  attention ", 10, "hybrid"))
+
+    assert "Attention" in first[-1]
+    assert second == [first[-1]]
+    assert len(requests) == 1
+
+
+def test_ask_cache_key_ignores_case_and_spacing():
+    """Questions that differ only in case and whitespace share a cache key."""
+    assert ui._ask_cache_key("What is  RAG?") == ui._ask_cache_key("what is rag?")
+    assert ui._ask_cache_key("What is RAG?") != ui._ask_cache_key("What is BERT?")
+
+
+def test_render_answer_escapes_text():
+    """Question, answer and sources are shown as text, not markup."""
+    rendered = ui._render_answer("<b>q</b>", "line <script>\nnext", ["<img src=x> - http://x?a=1&b=2"])
+
+    assert "<script>" not in rendered and "<b>q</b>" not in rendered and "<img" not in rendered
+    assert "line &lt;script&gt;<br>next" in rendered
+    assert "&lt;b&gt;q&lt;/b&gt;" in rendered
+    assert "a=1&amp;b=2" in rendered
@@ -0,0 +1,110 @@
+﻿"""
+Tests for the hybrid search result cache and rank fusion.
+"""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("opensearchpy")
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL not set (settings require it)", allow_module_level=True)
+
+from src.retrieval import hybrid_search
+from src.retrieval.hybrid_search import HybridSearch, _ProximityCache
+from src.retrieval.opensearch_client import OpenSearchClient
+
+PARAMS = (10, 0.5, (), None, ())
+
+
+def _unit(*values):
+    vec = np.array(values, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def test_cache_miss_when_empty():
+    """An empty cache never hits."""
+    cache = _ProximityCache(capacity=4)
+    assert cache.get(_unit(1, 0, 0), PARAMS) is None
+
+
+def test_cache_hit_for_same_query_and_params():
+    """Stored results come back for the same embedding and search parameters."""
+    cache = _ProximityCache(capacity=4)
+    results = [{"chunk_id": 1}]
+    cache.put(_unit(1, 0, 0), PARAMS, results)
+
+    assert cache.get(_unit(1, 0, 0), PARAMS) == results
+    assert cache.get(_unit(1, 0, 0), (5,) + PARAMS[1:]) is None
+
+
+def test_cache_threshold():
+    """Near-identical queries hit; queries below the cosine threshold miss."""
+    cache = _ProximityCache(capacity=4, threshold=0.97)
+    cache.put(_unit(1, 0, 0), PARAMS, [{"chunk_id": 1}])
+
+    assert cache.get(_unit(1, 0.1, 0), PARAMS) is not None   # cos ~ 0.995
+    assert cache.get(_unit(1, 0.3, 0), PARAMS) is None       # cos ~ 0.958
+
+
+def test_cache_evicts_least_recently_used():
+    """When full, the entry used longest ago is replaced."""
+    cache = _ProximityCache(capacity=2)
+    cache.put(_unit(1, 0, 0), PARAMS, ["a"])
+    cache.put(_unit(0, 1, 0), PARAMS, ["b"])
+    cache.get(_unit(1, 0, 0), PARAMS)
+    cache.put(_unit(0, 0, 1), PARAMS, ["c"])
+
+    assert cache.get(_unit(1, 0, 0), PARAMS) == ["a"]
+    assert cache.get(_unit(0, 1, 0), PARAMS) is None
+    assert cache.get(_unit(0, 0, 1), PARAMS) == ["c"]
+
+
+def test_cache_entries_expire(monkeypatch):
+    """Entries stop hitting once they are older than the TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(hybrid_search.time, "monotonic", lambda: now[0])
+    cache = _ProximityCache(capacity=4, ttl=60)
+    cache.put(_unit(1, 0, 0), PARAMS, ["a"])
+
+    now[0] += 59
+    assert cache.get(_unit(1, 0, 0), PARAMS) == ["a"]
+    now[0] += 2
+    assert cache.get(_unit(1, 0, 0), PARAMS) is None
+
+
+def _random_hits(rng, n):
+    """Search hits over a small id range, so chunks repeat within and across lists."""
+    return [
+        {
+            '_score': float(rng.random()),
+            '_source': {'chunk_id': int(rng.integers(0, 12)), 'text': f"hit {i}"}
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_rrf_arrays_matches_dict_version(seed):
+    """Vectorized RRF returns the same results, order and rows as the dict version."""
+    rng = np.random.default_rng(seed)
+    vector_hits = _random_hits(rng, int(rng.integers(0, 15)))
+    keyword_hits = _random_hits(rng, int(rng.integers(0, 15)))
+    alpha = float(rng.choice([0.0, 0.3, 0.5, 1.0]))
+    top_k = int(rng.integers(1, 10))
+
+    def as_dicts(hits):
+        return [{'score': hit['_score'], **hit['_source']} for hit in hits]
+
+    def as_arrays(hits):
+        return OpenSearchClient._hits_to_arrays({'hits': {'hits': hits}})
+
+    expected = HybridSearch._reciprocal_rank_fusion(
+        None, as_dicts(vector_hits), as_dicts(keyword_hits), alpha=alpha, k=60
+    )[:top_k]
+    actual = HybridSearch._reciprocal_rank_fusion_arrays(
+        as_arrays(vector_hits), as_arrays(keyword_hits), alpha=alpha, k=60, top_k=top_k
+    )
+
+    assert actual == expected
@@ -0,0 +1,87 @@
+﻿"""
+Tests for the batched Redis cache operations.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("redis")
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL not set (settings require it)", allow_module_level=True)
+
+from src.cache.redis_cache import RedisCache
+
+
+class FakeRedis:
+    """The subset of redis.Redis used by get_many/set_many, backed by a dict."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = 0
+
+    def ping(self):
+        return True
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        for key, ttl, value in self.commands:
+            self.redis.data[key] = value
+            self.redis.ttls[key] = ttl
+        return [True] * len(self.commands)
+
+
+@pytest.fixture
+def cache():
+    redis_cache = RedisCache(default_ttl=120)
+    redis_cache._client = FakeRedis()
+    redis_cache._connected = True
+    return redis_cache
+
+
+def test_set_many_then_get_many_round_trips(cache):
+    """Values written together come back together, one round trip each way."""
+    items = {"a": [1, 2], "b": {"x": 1}}
+
+    assert cache.set_many(items) is True
+    assert cache.get_many(["a", "b", "missing"]) == items
+    assert cache.client.round_trips == 2
+
+
+def test_set_many_applies_ttl(cache):
+    """Every key gets the given TTL, or the cache default."""
+    cache.set_many({"a": 1}, ttl=30)
+    cache.set_many({"b": 2})
+
+    assert cache.client.ttls == {"a": 30, "b": 120}
+
+
+def test_get_many_falls_back_to_text(cache):
+    """Values that are not pickles are returned as decoded text."""
+    cache.client.data["plain"] = b"hello"
+
+    assert cache.get_many(["plain"]) == {"plain": "hello"}
+
+
+def test_batch_operations_when_disconnected():
+    """Without Redis, lookups find nothing and writes report failure."""
+    redis_cache = RedisCache()
+
+    assert redis_cache.get_many(["a"]) == {}
+    assert redis_cache.set_many({"a": 1}) is False
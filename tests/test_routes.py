@@ -0,0 +1,127 @@
+﻿"""
+Tests for the search generator shared by the JSON and streaming endpoints.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("arxiv")
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL not set (settings require it)", allow_module_level=True)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api import routes
+from src.database.models import Base, Paper
+
+
+class DictCache:
+    """Stands in for the Redis-backed response cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def search(monkeypatch, db):
+    """Run _iter_search against SQLite; returns (run, arxiv_results, logged_counts)."""
+    arxiv_results = []
+    logged = []
+    monkeypatch.setattr(routes, "cache", DictCache())
+    monkeypatch.setattr(routes, "fetch_arxiv_papers", lambda query, max_results: list(arxiv_results))
+    monkeypatch.setattr(routes, "log_search", lambda db, query, count, *args: logged.append(count))
+
+    def run(query, limit):
+        request = routes.SearchRequest(query=query, limit=limit)
+        return list(routes._iter_search(request, None, db, None))
+
+    return run, arxiv_results, logged
+
+
+def _add_papers(db, *titles):
+    for i, title in enumerate(titles):
+        db.add(Paper(arxiv_id=f"db{i}", title=title, authors="A. Author", abstract="About attention."))
+    db.commit()
+
+
+def _arxiv_paper(arxiv_id, title):
+    return {
+        'id': arxiv_id, 'arxiv_id': arxiv_id, 'title': title, 'authors': "B. Author",
+        'abstract': "From arXiv.", 'url': f"https://arxiv.org/pdf/{arxiv_id}",
+        'published': "2023-01-01", 'category': "cs.CL"
+    }
+
+
+def test_enough_database_matches_skip_arxiv(search, db):
+    """A full page from the database is returned once, then served from cache."""
+    run, arxiv_results, logged = search
+    arxiv_results.append(_arxiv_paper("2301.1", "Never fetched"))
+    _add_papers(db, "Attention One", "Attention Two")
+
+    first = run("attention", 2)
+    second = run("attention", 2)
+
+    assert len(first) == 1
+    assert first[0]["source"] == "database" and first[0]["total"] == 2
+    assert first[0]["cached"] is False
+    assert second == [{**first[0], "cached": True}]
+    assert logged == [2, 2]
+
+
+def test_partial_database_matches_then_arxiv(search, db):
+    """Database matches are yielded as a partial result before the arXiv result."""
+    run, arxiv_results, logged = search
+    _add_papers(db, "Attention One")
+    arxiv_results.extend([_arxiv_paper("2301.1", "Attention A"), _arxiv_paper("2301.2", "Attention B")])
+
+    partial, complete = run("attention", 5)
+
+    assert partial["partial"] is True
+    assert [p["title"] for p in partial["papers"]] == ["Attention One"]
+    assert complete["source"] == "arxiv"
+    assert [p["title"] for p in complete["papers"]] == ["Attention A", "Attention B"]
+    assert db.query(Paper).filter(Paper.arxiv_id.in_(["2301.1", "2301.2"])).count() == 2
+    assert logged == [2]
+
+
+def test_partial_database_matches_kept_when_arxiv_is_empty(search, db):
+    """If arXiv finds nothing, the database matches are the complete result."""
+    run, _, logged = search
+    _add_papers(db, "Attention One")
+
+    partial, complete = run("attention", 5)
+    cached, = run("attention", 5)
+
+    assert partial["partial"] is True
+    assert complete["source"] == "database" and complete["cached"] is False
+    assert [p["title"] for p in complete["papers"]] == ["Attention One"]
+    assert complete["total"] == 1
+    assert cached == {**complete, "cached": True}
+    assert logged == [1, 1]
+
+
+def test_no_matches_anywhere(search):
+    """With nothing in the database or on arXiv, a single empty result is yielded."""
+    run, _, logged = search
+
+    results = run("nothing", 5)
+
+    assert results == [{"papers": [], "total": 0, "search_type": "hybrid", "source": "arxiv", "cached": False}]
+    assert logged == [0]
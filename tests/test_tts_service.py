@@ -0,0 +1,19 @@
+﻿"""
+Tests for the text cleaning done before speech synthesis.
+"""
+from src.services.tts_service import clean_text_for_speech
+
+
+def test_clean_text_strips_markdown():
+    """Emphasis and heading markers are not read aloud."""
+    assert clean_text_for_speech("# Answer\n**Transformers** use *attention*") == "Answer Transformers use attention"
+
+
+def test_clean_text_turns_paragraphs_into_pauses():
+    """Paragraph breaks become sentence breaks; other whitespace collapses."""
+    assert clean_text_for_speech("First point\n\nSecond   point\t here ") == "First point. Second point here"
+
+
+def test_clean_text_of_markup_only_is_empty():
+    """Text with nothing to say cleans to an empty string."""
+    assert clean_text_for_speech(" ** ## \n ") == ""